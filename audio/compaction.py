@@ -0,0 +1,146 @@
+# 📦 Standard Libraries
+import re
+
+# ⚙️ Compaction settings
+from audio.config import TRANSCRIPT_DROP_LOW_INFO, TRANSCRIPT_LOW_INFO_WORDS
+from utils.tokens import estimate_tokens
+
+# 🗣️ Disfluencies, removed with the commas around them (so "and, uh, the" becomes
+# "and the"). Case-sensitive and never right after a number, so "5 mm", "10 um" and
+# "the ER visit" survive. "er" / "mm" / "ah" are also units and abbreviations, so they
+# only count when lowercase and set off by a comma, or when they open a sentence
+_FILLER_WORDS = re.compile(
+    r"(?:,\s*)?\b(?<!\d\s)(?<!\d-)"
+    r"(?:"
+    r"(?:[Mm]m-hmm|[Uu]h-huh|[Uu]u*m+|[Uu]u*h+|[Uu]hm|[Ee]rm|[Hh]mm+|[Mm]hm)\b"
+    r"|(?:er|mm+|ah)(?=[,…])"
+    r"|(?:^|(?<=[.!?]\s))(?:[Mm]m+|[Aa]h|[Ee]r)(?=[,.!?…])"
+    r")[,.…]*"
+)
+
+# 💬 Phrase fillers, only removed when set off by commas ("we, you know, launched") or
+# opening a sentence ("I mean, the budget..."), so "do you know the budget" survives
+_FILLER_PHRASES = r"(?:you know|i mean|like|sort of|kind of)"
+_INLINE_FILLER_PHRASE = re.compile(rf",\s*{_FILLER_PHRASES}\s*,", re.IGNORECASE)
+_LEADING_FILLER_PHRASE = re.compile(
+    rf"(^|[.!?]\s+){_FILLER_PHRASES},\s*", re.IGNORECASE
+)
+
+# ✂️ Sentence boundaries inside a line (not after "Dr." / "Mr." style titles)
+_SENTENCE_END = re.compile(
+    r"(?<!\bDr\.)(?<!\bMr\.)(?<!\bMs\.)(?<!\bMrs\.)(?<!\bSt\.)(?<=[.!?])\s+"
+)
+
+# 🔁 Longest phrase checked for back-to-back repetition ("we will we will")
+MAX_REPEAT_NGRAM = 6
+
+# 🙊 Words that carry no information on their own (small talk and acknowledgements)
+_LOW_INFO_WORDS = {
+    "yeah", "yes", "yep", "no", "nope", "okay", "ok", "right", "sure", "so", "well",
+    "alright", "cool", "great", "good", "nice", "fine", "thanks", "thank", "you",
+    "hello", "hi", "hey", "bye", "goodbye", "oh", "wow", "exactly", "totally",
+    "absolutely", "definitely", "i", "it", "that", "this", "is", "a", "the", "and",
+    "to", "of", "me", "we", "can", "hear", "see", "just", "got", "it's", "that's",
+}
+
+# 📌 A sentence with any of these is never dropped as low-information: it may be a
+# task, an owner, a deadline or a number the summary's to-do list needs
+_ACTION_MARKERS = re.compile(
+    r"\d|\$|%|\b(?:will|need|must|should|send|share|call|email|follow|deadline|budget|"
+    r"price|cost|launch|deliver|schedule|meeting|today|tomorrow|week|month|monday|"
+    r"tuesday|wednesday|thursday|friday|saturday|sunday|agree|decide|approve)\w*",
+    re.IGNORECASE,
+)
+
+
+# 🔤 Comparison form of a word: lower case without surrounding punctuation
+def _norm(word):
+    return word.strip(".,!?;:\"'…-").lower()
+
+
+# 🔁 Drops back-to-back repeats of the same 1..MAX_REPEAT_NGRAM words, which is how
+# crosstalk and false starts show up in Whisper output. Phrases with digits are left
+# alone so figures like "5 5 5" are never merged
+def collapse_repeats(words):
+    kept = list(words)
+    removed = 0
+    i = 0
+
+    while i < len(kept):
+        for n in range(min(MAX_REPEAT_NGRAM, (len(kept) - i) // 2), 0, -1):
+            first = [_norm(word) for word in kept[i : i + n]]
+            if any(char.isdigit() for word in first for char in word) or not all(first):
+                continue
+            if first == [_norm(word) for word in kept[i + n : i + 2 * n]]:
+                # The kept copy ends like the dropped one did: "Cool cool cool." keeps
+                # its full stop, "the budget, the budget stays" loses the comma
+                last = kept[i + 2 * n - 1]
+                ending = last[len(last.rstrip(".,!?;:…")) :]
+                kept[i + n - 1] = kept[i + n - 1].rstrip(".,!?;:…") + ending
+                del kept[i + n : i + 2 * n]
+                removed += n
+                break
+        else:
+            i += 1
+
+    return kept, removed
+
+
+# 🙊 Short small-talk sentence with nothing the summary could use (sentences naming
+# someone mid-sentence are kept: they may say who owns a task)
+def is_low_information(sentence):
+    if _ACTION_MARKERS.search(sentence):
+        return False
+    if any(word[0].isupper() and word != "I" for word in sentence.split()[1:]):
+        return False
+    content = [word for word in map(_norm, sentence.split()) if word and word not in _LOW_INFO_WORDS]
+    return len(content) < TRANSCRIPT_LOW_INFO_WORDS
+
+
+# 🗜️ Deterministic transcript compaction before summarization: strips fillers,
+# collapses repeated phrases, normalises whitespace and (optionally) drops
+# low-information sentences. Line breaks (recording/speaker boundaries) are kept.
+# Returns the compacted text and a stats dict with the token reduction
+def compact_transcript(transcript_text, drop_low_info=None):
+    if drop_low_info is None:
+        drop_low_info = TRANSCRIPT_DROP_LOW_INFO
+
+    stats = {"fillers_removed": 0, "words_deduplicated": 0, "sentences_dropped": 0}
+    lines = []
+
+    for line in transcript_text.splitlines():
+        line, count = _FILLER_WORDS.subn(" ", line)
+        stats["fillers_removed"] += count
+
+        words, removed = collapse_repeats(line.split())
+        stats["words_deduplicated"] += removed
+        line = " ".join(words)
+
+        # Phrase fillers go after de-duplication, so "I mean, I mean," is one filler
+        line, count = _INLINE_FILLER_PHRASE.subn(" ", line)
+        stats["fillers_removed"] += count
+        line, count = _LEADING_FILLER_PHRASE.subn(r"\1", line)
+        stats["fillers_removed"] += count
+
+        # 🧹 Tidy what filler removal leaves behind: double spaces, " ," / ",," / leading commas
+        line = re.sub(r"\s{2,}", " ", line)
+        line = re.sub(r"\s+([,.!?;:])", r"\1", line)
+        line = re.sub(r"([,;])(?:\s*[,;])+", r"\1", line)
+        line = re.sub(r"(^|[.!?]\s+)[,;]\s*", r"\1", line).strip()
+        line = re.sub(r"(^|[.!?]\s+)([a-z])", lambda m: m.group(1) + m.group(2).upper(), line)
+
+        if drop_low_info and line:
+            sentences = _SENTENCE_END.split(line)
+            kept = [sentence for sentence in sentences if not is_low_information(sentence)]
+            stats["sentences_dropped"] += len(sentences) - len(kept)
+            line = " ".join(kept)
+
+        # Blank lines only survive as a single separator between recordings
+        if line or (lines and lines[-1]):
+            lines.append(line)
+
+    compacted = "\n".join(lines).strip()
+
+    stats["tokens_before"] = estimate_tokens(transcript_text)
+    stats["tokens_after"] = estimate_tokens(compacted)
+    return compacted, stats
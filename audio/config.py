@@ -7,8 +7,72 @@ from dotenv import load_dotenv
 # 🔐 Load all environment variables at runtime
 load_dotenv()
 
-# 🔑 OpenAI API key — used for Whisper and GPT calls
-OPENAI_KEY = os.getenv("OPENAI_KEY")
-
 # 📁 Folder ID in Google Drive where processed audio summaries should be uploaded
-AUDIO_DRIVE_FOLDER_ID = os.getenv("AUDIO_DRIVE_FOLDER_ID")
\ No newline at end of file
+AUDIO_DRIVE_FOLDER_ID = os.getenv("AUDIO_DRIVE_FOLDER_ID")
+
+# 🧵 Max number of audio chunks transcribed concurrently for one recording
+TRANSCRIBE_MAX_WORKERS = int(os.getenv("TRANSCRIBE_MAX_WORKERS", "4"))
+
+# 🗜️ Optional: downmix/resample/re-encode recordings before transcription to shrink
+# uploads (off by default; enable with AUDIO_PRECOMPRESS=true)
+AUDIO_PRECOMPRESS = os.getenv("AUDIO_PRECOMPRESS", "false").lower() == "true"
+
+# 🎚️ Codec ("mp3" or "opus") and bitrate used by the pre-compression stage
+AUDIO_PRECOMPRESS_FORMAT = os.getenv("AUDIO_PRECOMPRESS_FORMAT", "mp3").lower()
+AUDIO_PRECOMPRESS_BITRATE = os.getenv("AUDIO_PRECOMPRESS_BITRATE", "32k")
+
+# ✂️ Optional cap on chunk length in seconds (0 = only split to fit the 25MB limit);
+# smaller chunks mean more parallel Whisper calls
+AUDIO_CHUNK_SECONDS = int(os.getenv("AUDIO_CHUNK_SECONDS", "0"))
+
+# 🔗 Seconds of audio repeated at the start of each chunk, removed again when stitching
+AUDIO_CHUNK_OVERLAP_SECONDS = float(os.getenv("AUDIO_CHUNK_OVERLAP_SECONDS", "2"))
+
+# 🤫 What counts as a pause when placing chunk boundaries
+AUDIO_SILENCE_NOISE_DB = os.getenv("AUDIO_SILENCE_NOISE_DB", "-30dB")
+AUDIO_SILENCE_MIN_SECONDS = float(os.getenv("AUDIO_SILENCE_MIN_SECONDS", "0.4"))
+
+# 🗂️ Transcript cache keyed by the Drive md5Checksum: "local", "gcs" or "off"
+TRANSCRIPT_CACHE_BACKEND = os.getenv("TRANSCRIPT_CACHE_BACKEND", "local").lower()
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", ".cache/transcripts")
+TRANSCRIPT_CACHE_BUCKET = os.getenv("TRANSCRIPT_CACHE_BUCKET")
+TRANSCRIPT_CACHE_MAX_MB = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "500"))
+
+# 📁 On-disk cache of the client folder index, and how often to rebuild it from scratch
+FOLDER_INDEX_CACHE_PATH = os.getenv("FOLDER_INDEX_CACHE_PATH", ".cache/folder_index.json")
+FOLDER_INDEX_FULL_REFRESH_HOURS = float(os.getenv("FOLDER_INDEX_FULL_REFRESH_HOURS", "24"))
+
+# 🎙️ Recording formats picked up from a meeting folder, and whether to use them all
+# ("all": every recording, merged in order) or only the earliest one ("first")
+AUDIO_EXTENSIONS = tuple(
+    ext.strip().lower()
+    for ext in os.getenv("AUDIO_EXTENSIONS", ".m4a,.mp3,.wav,.webm,.ogg").split(",")
+    if ext.strip()
+)
+AUDIO_INGEST_MODE = os.getenv("AUDIO_INGEST_MODE", "all").lower()
+
+# 🧵 Max recordings of one meeting downloaded/prepared/transcribed at the same time
+RECORDING_MAX_WORKERS = int(os.getenv("RECORDING_MAX_WORKERS", "4"))
+
+# ⬇️ Drive download engine: bytes per request, size above which the file is fetched
+# as parallel HTTP Range requests, and how many ranges run at once (1 = sequential)
+DRIVE_DOWNLOAD_CHUNK_MB = int(os.getenv("DRIVE_DOWNLOAD_CHUNK_MB", "32"))
+DRIVE_PARALLEL_DOWNLOAD_MB = int(os.getenv("DRIVE_PARALLEL_DOWNLOAD_MB", "64"))
+DRIVE_DOWNLOAD_WORKERS = int(os.getenv("DRIVE_DOWNLOAD_WORKERS", "4"))
+
+# 🚰 Pipe the Drive stream straight into the ffmpeg pre-compression step instead of
+# landing the original recording on disk first (falls back to a download on failure)
+AUDIO_STREAM_TO_FFMPEG = os.getenv("AUDIO_STREAM_TO_FFMPEG", "false").lower() == "true"
+
+# 🧩 Map-reduce summarization: transcripts above this many (estimated) tokens are split
+# into segments of at most SUMMARY_SEGMENT_TOKENS, summarized concurrently, then merged
+SUMMARY_MAP_REDUCE_TOKENS = int(os.getenv("SUMMARY_MAP_REDUCE_TOKENS", "24000"))
+SUMMARY_SEGMENT_TOKENS = int(os.getenv("SUMMARY_SEGMENT_TOKENS", "8000"))
+SUMMARY_MAP_WORKERS = int(os.getenv("SUMMARY_MAP_WORKERS", "4"))
+
+# 🗜️ Transcript compaction before summarization (fillers, repeated phrases, whitespace);
+# optionally also drop small-talk sentences with fewer than TRANSCRIPT_LOW_INFO_WORDS
+# content words (sentences with numbers, dates or task verbs are always kept)
+TRANSCRIPT_COMPACTION = os.getenv("TRANSCRIPT_COMPACTION", "true").lower() == "true"
+TRANSCRIPT_DROP_LOW_INFO = os.getenv("TRANSCRIPT_DROP_LOW_INFO", "false").lower() == "true"
+TRANSCRIPT_LOW_INFO_WORDS = int(os.getenv("TRANSCRIPT_LOW_INFO_WORDS", "3"))
@@ -1,10 +1,11 @@
-from docx import Document
 import io
 
 
 # 📝 Generates a structured DOCX meeting summary from the provided summary data
 def generate_docx(summary_data, company_name, meeting_date):
     
+    from docx import Document
+
     # Create a new Word document
     doc = Document()
 
@@ -46,5 +47,5 @@ def generate_docx(summary_data, company_name, meeting_date):
     doc.save(docx_stream)
     docx_stream.seek(0)
 
-    # Return the document content as binary data (for in-memory uploads)
-    return docx_stream.read()
\ No newline at end of file
+    # Return the stream itself (uploads read it in place, no extra copy)
+    return docx_stream
\ No newline at end of file
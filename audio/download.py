@@ -0,0 +1,134 @@
+# 📦 Standard Libraries
+import os
+import time
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# ⚙️ Download engine settings
+from audio.config import (
+    DRIVE_DOWNLOAD_CHUNK_MB,
+    DRIVE_PARALLEL_DOWNLOAD_MB,
+    DRIVE_DOWNLOAD_WORKERS,
+)
+
+# 🔌 Shared Google API client registry
+from utils.google_clients import get_service, get_authorized_session
+
+# 🔧 Drive API scope and media endpoint
+SCOPES = ["https://www.googleapis.com/auth/drive"]
+MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{file_id}?alt=media&supportsAllDrives=true"
+
+# 🔁 Attempts per byte range before the download fails
+RANGE_ATTEMPTS = 3
+
+
+# 📈 Prints size, time and throughput of a finished download
+def _report(size_bytes, started, mode):
+    elapsed = max(time.perf_counter() - started, 1e-6)
+    size_mb = size_bytes / 1024 / 1024
+    print(f"⬇️ Downloaded {round(size_mb, 2)}MB in {round(elapsed, 1)}s ({round(size_mb / elapsed, 2)} MB/s, {mode})")
+
+
+# ⬇️ Sequential download with the Drive client, using large chunks
+def _download_sequential(file_id, path, chunk_size):
+    from googleapiclient.http import MediaIoBaseDownload  # Loaded on first download
+
+    request = get_service("drive", "v3", SCOPES).files().get_media(
+        fileId=file_id, supportsAllDrives=True
+    )
+    with open(path, "wb") as f:
+        downloader = MediaIoBaseDownload(f, request, chunksize=chunk_size)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+            print(f"Downloading audio: {int(status.progress() * 100)}%")
+
+
+# 🧩 Fetch one byte range and write it at its offset
+def _fetch_range(file_id, path, start, end):
+    for attempt in range(RANGE_ATTEMPTS):
+        try:
+            response = get_authorized_session(SCOPES).get(
+                MEDIA_URL.format(file_id=file_id),
+                headers={"Range": f"bytes={start}-{end}"},
+                stream=True,
+                timeout=(10, 120),
+            )
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise Exception(f"Range request not honoured (HTTP {response.status_code})")
+
+            with open(path, "r+b") as f:
+                f.seek(start)
+                for block in response.iter_content(1024 * 1024):
+                    f.write(block)
+            return
+
+        except Exception as e:
+            if attempt == RANGE_ATTEMPTS - 1:
+                raise
+            print(f"⚠️ Range {start}-{end} failed ({e}); retrying...")
+            time.sleep(2**attempt)
+
+
+# ⬇️ Parallel download: chunk-sized HTTP Range requests written into a preallocated file
+def _download_ranged(file_id, path, size, chunk_size, workers):
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+    ranges = [(start, min(start + chunk_size, size) - 1) for start in range(0, size, chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="range") as pool:
+        futures = [pool.submit(_fetch_range, file_id, path, start, end) for start, end in ranges]
+        for future in futures:
+            future.result()
+
+
+# ⬇️ Download a Drive file to `path`; large files of known size use parallel ranges
+def download_file(file_id, path, size=None):
+    chunk_size = DRIVE_DOWNLOAD_CHUNK_MB * 1024 * 1024
+    size = int(size) if size else None
+    started = time.perf_counter()
+
+    if (
+        size
+        and DRIVE_DOWNLOAD_WORKERS > 1
+        and size >= DRIVE_PARALLEL_DOWNLOAD_MB * 1024 * 1024
+    ):
+        _download_ranged(file_id, path, size, chunk_size, DRIVE_DOWNLOAD_WORKERS)
+        _report(size, started, f"{DRIVE_DOWNLOAD_WORKERS} parallel ranges")
+    else:
+        _download_sequential(file_id, path, chunk_size)
+        _report(os.path.getsize(path), started, "sequential")
+
+    return path
+
+
+# 🚰 Stream a Drive file's bytes without writing them to disk
+def iter_drive_file(file_id, block_size=1024 * 1024):
+    response = get_authorized_session(SCOPES).get(
+        MEDIA_URL.format(file_id=file_id), stream=True, timeout=(10, 120)
+    )
+    response.raise_for_status()
+    try:
+        yield from response.iter_content(block_size)
+    finally:
+        response.close()
+
+
+# 🧹 Remove a file if it is still there
+def remove_file(path):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+# 🗑️ Temporary local copy of a Drive file, deleted when the block exits (also on errors)
+@contextmanager
+def temporary_download(file_id, suffix=".m4a", size=None):
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        download_file(file_id, path, size)
+        yield path
+    finally:
+        remove_file(path)
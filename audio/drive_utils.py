@@ -1,125 +1,151 @@
-# 📦 Standard Libraries
-import os
-import io
-import tempfile
-
 # 🌐 Third-Party Libraries
 from dotenv import load_dotenv
-from google.auth import default
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
 
 # 🔐 Load environment variables
 load_dotenv()
 
-# 🔧 Config: Path to service account + Drive API scopes
-GOOGLE_SA_FILE = os.getenv("GOOGLE_SA_FILE")
+# 🔌 Shared Google API client registry and upload path
+from utils.google_clients import get_service
+from utils.drive_upload import upload_buffer, find_reusable_upload
+
+# 🔧 Config: Drive API scopes
 SCOPES = ["https://www.googleapis.com/auth/drive"]
 
 
-# 📡 Authenticate using a service account and return a Drive API client
+# 📡 Return this thread's Drive API client (built once, reused for the whole run)
 def get_drive_service():
-    creds, _ = default(scopes=SCOPES)  # ✅ Uses Cloud Run attached service account
-    return build("drive", "v3", credentials=creds)
+    return get_service("drive", "v3", SCOPES)  # ✅ Uses Cloud Run attached service account
+
+
+# 📤 Upload a DOCX file to Google Drive (from memory: bytes, memoryview or BytesIO)
+def upload_file_to_drive_in_memory(
+    file_data, folder_id, final_name="Summary.docx", app_properties=None
+):
+    file = upload_buffer(
+        file_data,
+        final_name,
+        folder_id,
+        scopes=SCOPES,
+        fields="id",
+        app_properties=app_properties,
+    )
 
+    print(f"📤 File uploaded: {file.get('id')}")
+    return file.get("id")
 
-# ⬇️ Download a file (e.g., audio) from Google Drive and save it temporarily
-def download_audio_from_drive(file_id):
-    service = get_drive_service()
-    request = service.files().get_media(fileId=file_id)
 
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".m4a")
-    downloader = MediaIoBaseDownload(temp_file, request)
-    done = False
+# ♻️ ID of meeting notes already uploaded for this row (see find_reusable_upload)
+def find_uploaded_audio_doc(folder_id, app_properties, known_id=None):
+    return find_reusable_upload(folder_id, app_properties, known_id, SCOPES)
 
-    while not done:
-        status, done = downloader.next_chunk()
-        print(f"Downloading audio: {int(status.progress() * 100)}%")
 
-    temp_file.close()
-    return temp_file.name
+# 🎛️ Only the fields the audio branch needs (cache key, size check, ordering, download)
+AUDIO_FILE_FIELDS = "id, name, size, md5Checksum, modifiedTime, createdTime"
 
+# 📦 Drive accepts at most 100 calls in one batch HTTP request
+DRIVE_BATCH_LIMIT = 100
 
-# 📤 Upload a DOCX file to Google Drive (from memory)
-def upload_file_to_drive_in_memory(file_data, folder_id, final_name="Summary.docx"):
-    service = get_drive_service()
 
-    file_metadata = {"name": final_name, "parents": [folder_id]}
-    file_stream = io.BytesIO(file_data)
-
-    media = MediaIoBaseUpload(
-        file_stream,
-        mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        resumable=True,
+# 🔎 Drive query for candidate audio files in a folder (filtering happens server-side)
+def _audio_query(folder_id, extensions):
+    name_filters = " or ".join(f"name contains '{ext}'" for ext in extensions)
+    return (
+        f"'{folder_id}' in parents and trashed=false and "
+        f"(mimeType contains 'audio/' or {name_filters})"
     )
 
-    file = (
-        service.files()
-        .create(
-            body=file_metadata,
-            media_body=media,
-            fields="id",
-            supportsAllDrives=True,
-        )
-        .execute()
-    )
 
-    print(f"📤 File uploaded: {file.get('id')}")
-    return file.get("id")
+# 🎯 Files whose name ends with one of the extensions (Drive's name filter is
+# word-based), oldest first so multi-part meetings come out in recording order
+def _matching_audio_files(files, extensions):
+    matches = [file for file in files if file["name"].lower().endswith(tuple(extensions))]
+    return sorted(matches, key=lambda file: (file.get("createdTime", ""), file["name"].lower()))
 
 
-# 🔍 Find the first audio file in a folder by extension
-def find_audio_file_in_folder(folder_id, extension=".m4a"):
-    service = get_drive_service()
-    query = f"'{folder_id}' in parents"
-    results = (
-        service.files()
-        .list(
-            q=f"'{folder_id}' in parents",
-            fields="files(id, name)",
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True,
-        )
-        .execute()
-    )
-
-    files = results.get("files", [])
+# 🔍 Find every audio file in a folder with one of the extensions, in recording order
+def find_audio_files_info_in_folder(folder_id, extensions=(".m4a",)):
+    files = list_drive_files(_audio_query(folder_id, extensions), AUDIO_FILE_FIELDS)
+    files = _matching_audio_files(files, extensions)
 
     for file in files:
-        if file["name"].lower().endswith(extension):
-            print(f"🎯 Found audio file: {file['name']}")
-            return file["id"]
-
-    print("⚠️ No .m4a file found in folder.")
-    return None
+        print(f"🎯 Found audio file: {file['name']}")
+    if not files:
+        print(f"⚠️ No {'/'.join(extensions)} file found in folder.")
+    return files
 
 
-# 🔍 Try to find a folder matching keywords from the company name
-def find_folder_id_by_partial_name(company_name, parent_folder_id):
+# 📬 Resolve the audio files of many folders with Drive batch HTTP requests
+# (one round trip per 100 folders). Returns {folder_id: [files in recording order]};
+# folders whose lookup failed or had more than one page of results are resolved one
+# by one instead.
+def find_audio_files_in_folders(folder_ids, extensions=(".m4a",)):
     service = get_drive_service()
-
-    # 🔍 Get all folders under the parent folder
-    query = f"mimeType='application/vnd.google-apps.folder' and '{parent_folder_id}' in parents"
-    response = (
-        service.files()
-        .list(
-            q=query,
-            fields="files(id, name)",
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True,
+    folder_ids = list(dict.fromkeys(folder_ids))
+    found = {}
+    retry = []
+
+    def on_response(request_id, response, exception):
+        if exception is not None or response.get("nextPageToken"):
+            retry.append(request_id)
+        else:
+            found[request_id] = _matching_audio_files(response.get("files", []), extensions)
+
+    for start in range(0, len(folder_ids), DRIVE_BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=on_response)
+        for folder_id in folder_ids[start : start + DRIVE_BATCH_LIMIT]:
+            batch.add(
+                service.files().list(
+                    q=_audio_query(folder_id, extensions),
+                    fields=f"nextPageToken, files({AUDIO_FILE_FIELDS})",
+                    pageSize=1000,
+                    supportsAllDrives=True,
+                    includeItemsFromAllDrives=True,
+                ),
+                request_id=folder_id,
+            )
+        batch.execute()
+
+    for folder_id in retry:
+        found[folder_id] = find_audio_files_info_in_folder(folder_id, extensions)
+
+    print(f"🎯 Audio discovery: {len(folder_ids)} folder(s), {sum(1 for f in found.values() if f)} with audio")
+    return found
+
+
+# 📚 List every file matching a Drive query, following nextPageToken across pages
+def list_drive_files(query, file_fields):
+    service = get_drive_service()
+    files = []
+    page_token = None
+
+    while True:
+        response = (
+            service.files()
+            .list(
+                q=query,
+                fields=f"nextPageToken, files({file_fields})",
+                pageSize=1000,
+                pageToken=page_token,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+            )
+            .execute()
         )
-        .execute()
-    )
+        files.extend(response.get("files", []))
+        page_token = response.get("nextPageToken")
 
-    folders = response.get("files", [])
-    company_keywords = company_name.lower().split()
+        if not page_token:
+            return files
+
+
+# 🔍 Try to find the folder that best matches the company name (index built once per run)
+def find_folder_id_by_partial_name(company_name, parent_folder_id):
+    from audio.folder_index import get_folder_index
 
-    # ✅ Partial keyword match: any keyword in folder name
-    for folder in folders:
-        folder_name = folder["name"].lower()
-        if any(keyword in folder_name for keyword in company_keywords):
-            print(f"📁 Matched folder: {folder['name']}")
-            return folder["id"]
+    folder = get_folder_index(parent_folder_id).best_match(company_name)
+    if folder:
+        print(f"📁 Matched folder: {folder['name']}")
+        return folder["id"]
 
     print(f"❌ No folder matched any part of: {company_name}")
     return None
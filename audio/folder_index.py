@@ -0,0 +1,185 @@
+# 📦 Standard Libraries
+import os
+import re
+import json
+import math
+import time
+import threading
+from collections import defaultdict
+
+# ⚙️ Cache location and full-rebuild interval
+from audio.config import FOLDER_INDEX_CACHE_PATH, FOLDER_INDEX_FULL_REFRESH_HOURS
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+# 🚫 Words that never identify a client on their own ("Omega Ltd" must not match "Acme Ltd")
+GENERIC_TOKENS = {
+    "the", "and", "of", "co", "company", "ltd", "limited", "pvt", "private",
+    "inc", "llc", "llp", "corp", "corporation", "group", "services", "solutions",
+}
+
+
+# 🔤 Lower-case alphanumeric tokens of a name ("Acme-Corp Ltd." → ["acme", "corp", "ltd"])
+def tokenize(name):
+    return re.findall(r"[a-z0-9]+", name.lower())
+
+
+# 🗂️ Index of the client folders under one parent, with token-based best-match lookup
+class FolderIndex:
+    def __init__(self, parent_folder_id, folders):
+        self.parent_folder_id = parent_folder_id
+        self.folders = folders  # {folder_id: {"name": ..., "modifiedTime": ...}}
+        self._rebuild_tokens()
+
+    # 🔁 Inverted index: token → ids of folders whose name contains that token
+    def _rebuild_tokens(self):
+        self.tokens = defaultdict(set)
+        self.folder_tokens = {}
+        for folder_id, folder in self.folders.items():
+            folder_tokens = set(tokenize(folder["name"]))
+            self.folder_tokens[folder_id] = folder_tokens
+            for token in folder_tokens:
+                self.tokens[token].add(folder_id)
+
+    # ⚖️ Rare tokens (e.g. a brand name) count more than common ones (e.g. "ltd")
+    def _weight(self, token):
+        return math.log(1 + len(self.folders) / (1 + len(self.tokens.get(token, ()))))
+
+    # 🎯 Best-scoring folder for a company name, or None
+    def best_match(self, company_name):
+        company_tokens = list(dict.fromkeys(tokenize(company_name)))
+        if not company_tokens or not self.folders:
+            return None
+
+        total_weight = sum(self._weight(token) for token in company_tokens)
+        scores = defaultdict(float)
+
+        # Whole-token hits through the inverted index
+        for token in company_tokens:
+            for folder_id in self.tokens.get(token, ()):
+                scores[folder_id] += self._weight(token)
+
+        # Fall back to substring hits (e.g. "acme" in "acmecorp") only when no token hit
+        if not scores:
+            for folder_id, folder in self.folders.items():
+                folder_name = folder["name"].lower()
+                for token in company_tokens:
+                    if token in folder_name:
+                        scores[folder_id] += self._weight(token) * 0.5
+
+        # A folder that shares only generic words with the company name is not a match
+        distinctive = set(company_tokens) - GENERIC_TOKENS
+        if distinctive:
+            scores = {
+                folder_id: score
+                for folder_id, score in scores.items()
+                if any(token in self.folders[folder_id]["name"].lower() for token in distinctive)
+            }
+
+        if not scores:
+            return None
+
+        joined_name = "".join(company_tokens)
+
+        def rank(folder_id):
+            folder_tokens = self.folder_tokens[folder_id]
+            coverage = scores[folder_id] / total_weight
+            # Prefer folders whose whole name matches, then folders with fewer extra words
+            exact = 1.0 if joined_name in "".join(tokenize(self.folders[folder_id]["name"])) else 0.0
+            precision = len(folder_tokens & set(company_tokens)) / max(1, len(folder_tokens))
+            return (coverage + exact, precision, self.folders[folder_id]["name"])
+
+        best_id = max(scores, key=rank)
+        return {"id": best_id, **self.folders[best_id]}
+
+    # 🆕 Apply folders changed since the last sync (new, renamed, trashed or moved away)
+    def apply_changes(self, changed_folders):
+        for folder in changed_folders:
+            if folder.get("trashed") or self.parent_folder_id not in folder.get("parents", []):
+                self.folders.pop(folder["id"], None)
+            else:
+                self.folders[folder["id"]] = {
+                    "name": folder["name"],
+                    "modifiedTime": folder["modifiedTime"],
+                }
+        self._rebuild_tokens()
+
+    # 🕒 Latest modifiedTime seen (RFC 3339 strings sort chronologically)
+    def last_modified(self):
+        return max((folder["modifiedTime"] for folder in self.folders.values()), default=None)
+
+
+# 💾 Load the cached index for a parent folder ({} when missing or unreadable)
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_cache(cache_path, cache):
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    temp_path = f"{cache_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(temp_path, cache_path)
+
+
+# 🏗️ Build the index: incremental refresh from the on-disk cache when it is fresh,
+# full paginated listing otherwise
+def build_folder_index(parent_folder_id, cache_path=FOLDER_INDEX_CACHE_PATH):
+    from audio.drive_utils import list_drive_files
+
+    cache = _load_cache(cache_path)
+    entry = cache.get(parent_folder_id)
+    max_age = FOLDER_INDEX_FULL_REFRESH_HOURS * 3600
+
+    if entry and time.time() - entry.get("built_at", 0) < max_age:
+        index = FolderIndex(parent_folder_id, entry["folders"])
+        since = index.last_modified()
+
+        if since:
+            changed = list_drive_files(
+                f"mimeType='{FOLDER_MIME_TYPE}' and modifiedTime > '{since}'",
+                "id, name, modifiedTime, parents, trashed",
+            )
+            # Changes elsewhere in Drive are ignored unless they concern this parent
+            changed = [
+                folder
+                for folder in changed
+                if folder["id"] in index.folders
+                or parent_folder_id in folder.get("parents", [])
+            ]
+            index.apply_changes(changed)
+            print(f"📁 Folder index: {len(index.folders)} folder(s), {len(changed)} changed")
+
+        built_at = entry["built_at"]
+
+    else:
+        folders = list_drive_files(
+            f"mimeType='{FOLDER_MIME_TYPE}' and '{parent_folder_id}' in parents and trashed=false",
+            "id, name, modifiedTime",
+        )
+        index = FolderIndex(
+            parent_folder_id,
+            {f["id"]: {"name": f["name"], "modifiedTime": f["modifiedTime"]} for f in folders},
+        )
+        built_at = time.time()
+        print(f"📁 Folder index: {len(index.folders)} folder(s) listed")
+
+    cache[parent_folder_id] = {"built_at": built_at, "folders": index.folders}
+    _save_cache(cache_path, cache)
+    return index
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+# 🏭 The run's index for a parent folder, built on first use and shared by all threads
+def get_folder_index(parent_folder_id):
+    with _indexes_lock:
+        if parent_folder_id not in _indexes:
+            _indexes[parent_folder_id] = build_folder_index(parent_folder_id)
+        return _indexes[parent_folder_id]
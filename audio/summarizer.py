@@ -1,12 +1,24 @@
-import openai
+# 📦 Standard Libraries
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from audio.config import (
+    SUMMARY_MAP_REDUCE_TOKENS,
+    SUMMARY_SEGMENT_TOKENS,
+    SUMMARY_MAP_WORKERS,
+)
 from audio.utils import extract_json_block
+from utils.llm_cache import get_response_cache
+from utils.openai_gateway import get_openai_gateway
+from utils.tokens import estimate_tokens, CHARS_PER_TOKEN
 
+# 🤖 Model settings (also part of the response cache key)
+SUMMARY_MODEL = "gpt-4.1-2025-04-14"
+SUMMARY_TEMPERATURE = 0.3  # Low temperature for deterministic, consistent output
 
-# 🧠 Generates a structured summary from raw meeting transcript text using OpenAI GPT
-def generate_summary(transcript_text):
-    
-    # 📝 Prompt instructing GPT to act as a business analyst and return JSON
-    system_prompt = """
+# 📝 Prompt instructing GPT to act as a business analyst and return JSON
+SYSTEM_PROMPT = """
 You are an expert business analyst. You will be given a raw transcript from a client-agency meeting.
 
 Your task is to extract a comprehensive and structured summary in JSON format using the schema below.
@@ -34,15 +46,148 @@ Schema:
   }
 }
 """
-    # 🧾 Make a GPT API call using the transcript as input
-    chat_response = openai.ChatCompletion.create(
-        model="gpt-4.1-2025-04-14",
+
+# 🧩 Map step: the same schema, applied to one part of a long meeting
+SEGMENT_PROMPT = SYSTEM_PROMPT + """
+Note: the transcript you are given is one consecutive part of a longer meeting. Summarize
+only what is said in this part; other parts are summarized separately and merged later.
+"""
+
+# 🔗 Reduce step: merge the partial summaries of one meeting into the final summary
+REDUCE_PROMPT = """
+You are an expert business analyst. You will be given a JSON list of partial summaries,
+each covering one consecutive part of the same client-agency meeting, in order.
+
+Merge them into ONE summary of the whole meeting using exactly the same schema:
+- Combine items that describe the same point, decision or task into a single bullet.
+- Keep every distinct action item, owner, deadline, budget figure and decision.
+- Where a later part revises an earlier one, keep the later version.
+- Keep the bullets concise, professional and standalone.
+
+Return **only valid JSON** with no extra text, markdown, or explanation.
+
+""" + SYSTEM_PROMPT[SYSTEM_PROMPT.index("Schema:"):]
+
+# ✂️ Speaker turns / paragraphs first; sentences only when a single turn is too long
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+# 🤖 One GPT call returning parsed JSON, served from the response cache when possible
+def _summarize_json(system_prompt, user_text):
+    # ♻️ Reuse the parsed result if this exact input was summarized before
+    cache = get_response_cache()
+    if cache:
+        cached = cache.get(SUMMARY_MODEL, SUMMARY_TEMPERATURE, system_prompt, user_text)
+        if cached is not None:
+            print("♻️ Using cached meeting summary.")
+            return cached
+
+    # 🧾 Make a GPT API call using the transcript as input (paced and retried by the gateway)
+    chat_response = get_openai_gateway().chat_completion(
+        idempotent=True,  # Same prompt, same summary: safe to hedge
+        model=SUMMARY_MODEL,
         messages=[
             {"role": "system", "content": system_prompt},   # Provides instructions to GPT
-            {"role": "user", "content": transcript_text},   # Supplies the raw transcript
+            {"role": "user", "content": user_text},         # Supplies the transcript
         ],
-        temperature=0.3,  # Low temperature for deterministic, consistent output
+        temperature=SUMMARY_TEMPERATURE,
     )
 
-    # 🔍 Extract the JSON content from the GPT response
-    return extract_json_block(chat_response.choices[0].message.content)
\ No newline at end of file
+    # 🔍 Extract the JSON content from the GPT response (raises if it isn't valid JSON)
+    summary = extract_json_block(chat_response.choices[0].message.content)
+
+    if cache:
+        cache.set(SUMMARY_MODEL, SUMMARY_TEMPERATURE, system_prompt, user_text, summary)
+    return summary
+
+
+# 🔪 Splits a transcript into segments of at most max_tokens, cutting on speaker turns
+# and paragraphs (line breaks) where possible, then on sentence ends, then hard
+def split_transcript(transcript_text, max_tokens):
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    units = []  # (text, separator from the previous unit)
+
+    for turn in transcript_text.splitlines():
+        turn = turn.strip()
+        if not turn:
+            continue
+        if len(turn) <= max_chars:
+            units.append((turn, "\n"))
+            continue
+
+        separator = "\n"
+        for sentence in _SENTENCE_END.split(turn):
+            while len(sentence) > max_chars:
+                units.append((sentence[:max_chars], separator))
+                sentence = sentence[max_chars:]
+                separator = " "
+            if sentence:
+                units.append((sentence, separator))
+                separator = " "
+
+    # 📦 Pack consecutive units into as few segments as the budget allows
+    segments = []
+    current = ""
+    for unit, separator in units:
+        if current and len(current) + 1 + len(unit) > max_chars:
+            segments.append(current)
+            current = ""
+        current = f"{current}{separator}{unit}" if current else unit
+    if current:
+        segments.append(current)
+
+    return segments
+
+
+# 🧮 Deterministic merge of partial summaries (exact duplicates removed, order kept);
+# used when the reduce call itself fails so a long meeting still gets its notes
+def merge_summaries(partials):
+    def unique(items):
+        seen = set()
+        result = []
+        for item in items:
+            key = item.strip().lower() if isinstance(item, str) else json.dumps(item)
+            if key not in seen:
+                seen.add(key)
+                result.append(item)
+        return result
+
+    merged = {"mom": [], "todo_list": [], "action_plan": {}}
+    for partial in partials:
+        merged["mom"].extend(partial.get("mom") or [])
+        merged["todo_list"].extend(partial.get("todo_list") or [])
+        for field, items in (partial.get("action_plan") or {}).items():
+            merged["action_plan"].setdefault(field, []).extend(items or [])
+
+    merged["mom"] = unique(merged["mom"])
+    merged["todo_list"] = unique(merged["todo_list"])
+    for field, items in merged["action_plan"].items():
+        merged["action_plan"][field] = unique(items)
+    return merged
+
+
+# 🧩 Map-reduce path for long meetings: segments are summarized concurrently into the
+# same schema, then one reduce call merges and de-duplicates them
+def _map_reduce_summary(transcript_text):
+    segments = split_transcript(transcript_text, SUMMARY_SEGMENT_TOKENS)
+    print(f"🧩 Long transcript: summarizing {len(segments)} segment(s) concurrently")
+
+    with ThreadPoolExecutor(max_workers=SUMMARY_MAP_WORKERS) as pool:
+        partials = list(pool.map(lambda segment: _summarize_json(SEGMENT_PROMPT, segment), segments))
+
+    if len(partials) == 1:
+        return partials[0]
+
+    try:
+        return _summarize_json(REDUCE_PROMPT, json.dumps(partials, ensure_ascii=False, indent=1))
+    except Exception as e:
+        print(f"⚠️ Reduce step failed ({e}) — merging segment summaries without GPT")
+        return merge_summaries(partials)
+
+
+# 🧠 Generates a structured summary from raw meeting transcript text using OpenAI GPT;
+# transcripts above SUMMARY_MAP_REDUCE_TOKENS take the map-reduce path
+def generate_summary(transcript_text):
+    if estimate_tokens(transcript_text) > SUMMARY_MAP_REDUCE_TOKENS:
+        return _map_reduce_summary(transcript_text)
+    return _summarize_json(SYSTEM_PROMPT, transcript_text)
@@ -0,0 +1,173 @@
+# 📦 Standard Libraries
+import os
+import threading
+
+# ⚙️ Cache settings (backend, location and size budget)
+from audio.config import (
+    TRANSCRIPT_CACHE_BACKEND,
+    TRANSCRIPT_CACHE_DIR,
+    TRANSCRIPT_CACHE_BUCKET,
+    TRANSCRIPT_CACHE_MAX_MB,
+)
+
+# 🏷️ Bump when transcription settings change in a way that should invalidate old entries
+TRANSCRIPT_CACHE_VERSION = "whisper-1-translate-v1"
+
+
+# 💾 Local-disk blob store (also the stand-in for GCS when testing)
+class LocalBlobStore:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.txt")
+
+    # A file evicted by another recording between the read and the touch is a miss
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+
+            # Touch the file so eviction treats it as recently used
+            os.utime(path)
+        except OSError:
+            return None
+
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    # 📋 (key, size_bytes, last_used_timestamp) for every stored entry
+    def entries(self):
+        result = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".txt"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue  # Deleted meanwhile
+            result.append((name[: -len(".txt")], stat.st_size, stat.st_mtime))
+        return result
+
+
+# ☁️ Google Cloud Storage blob store (persists across Cloud Run job executions)
+class GCSBlobStore:
+    def __init__(self, bucket_name, prefix="transcripts/"):
+        from google.cloud import storage  # Optional dependency, only needed for this backend
+
+        self.bucket = storage.Client().bucket(bucket_name)
+        self.prefix = prefix
+
+    def get(self, key):
+        blob = self.bucket.blob(f"{self.prefix}{key}.txt")
+        if not blob.exists():
+            return None
+        return blob.download_as_bytes()
+
+    def put(self, key, data):
+        blob = self.bucket.blob(f"{self.prefix}{key}.txt")
+        blob.upload_from_string(data, content_type="text/plain; charset=utf-8")
+
+    def delete(self, key):
+        blob = self.bucket.blob(f"{self.prefix}{key}.txt")
+        if blob.exists():
+            blob.delete()
+
+    def entries(self):
+        result = []
+        for blob in self.bucket.list_blobs(prefix=self.prefix):
+            key = blob.name[len(self.prefix) :]
+            if key.endswith(".txt"):
+                result.append((key[: -len(".txt")], blob.size or 0, blob.updated.timestamp()))
+        return result
+
+
+# 🗂️ Content-addressed transcript cache with size-based (least recently used) eviction
+class TranscriptCache:
+    def __init__(self, store, max_bytes):
+        self.store = store
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # 🔑 Same audio bytes (Drive md5 + size) and same transcription settings → same key
+    @staticmethod
+    def key_for(md5_checksum, size):
+        return f"{md5_checksum}_{size}_{TRANSCRIPT_CACHE_VERSION}"
+
+    # 🔍 Best effort: a store failure (disk, GCS) is a miss, never a failed row
+    def get(self, md5_checksum, size):
+        if not md5_checksum:
+            return None
+
+        try:
+            data = self.store.get(self.key_for(md5_checksum, size))
+        except Exception as e:
+            print(f"⚠️ Transcript cache lookup failed, transcribing instead: {e}")
+            return None
+        return data.decode("utf-8") if data is not None else None
+
+    # 💾 Best effort: the transcript is already paid for, so a store failure is only logged
+    def put(self, md5_checksum, size, transcript):
+        if not md5_checksum:
+            return
+
+        try:
+            self.store.put(self.key_for(md5_checksum, size), transcript.encode("utf-8"))
+            self.evict()
+        except Exception as e:
+            print(f"⚠️ Could not cache transcript: {e}")
+
+    # 🧹 Drop least recently used entries until the cache fits its size budget
+    def evict(self):
+        with self._lock:
+            entries = sorted(self.store.entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+
+            for key, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                self.store.delete(key)
+                total -= size
+                print(f"🧹 Evicted cached transcript: {key}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# 🏭 Process-wide cache built from the environment (None when caching is off)
+def get_transcript_cache():
+    global _cache
+
+    if TRANSCRIPT_CACHE_BACKEND == "off":
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            try:
+                if TRANSCRIPT_CACHE_BACKEND == "gcs":
+                    store = GCSBlobStore(TRANSCRIPT_CACHE_BUCKET)
+                else:
+                    store = LocalBlobStore(TRANSCRIPT_CACHE_DIR)
+                _cache = TranscriptCache(store, TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024)
+
+            # Run without the cache rather than failing every row
+            except Exception as e:
+                print(f"⚠️ Transcript cache unavailable, continuing without it: {e}")
+                _cache = False
+
+        return _cache or None
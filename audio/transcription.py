@@ -1,23 +1,64 @@
-import openai
-from audio.config import OPENAI_KEY
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-# 🔐 Set the OpenAI API key (loaded from .env via config)
-openai.api_key = OPENAI_KEY
+from audio.config import TRANSCRIBE_MAX_WORKERS
+from audio.utils import probe_audio, stitch_transcripts
+from utils.openai_gateway import get_openai_gateway
 
 
 # 🎧 Transcribes an audio file to text using OpenAI Whisper API
-def transcribe_audio(audio_path):
+def transcribe_audio(audio_path, duration_seconds=None):
     print("🎙️ Transcribing with OpenAI Whisper API...")
-    
-    # Open the audio file in binary mode
-    with open(audio_path, "rb") as audio_file:
-        # 🔁 Send file to OpenAI Whisper for transcription (English translation)
-        response = openai.Audio.transcribe(
-            model="whisper-1",       # Use Whisper model
-            file=audio_file,         # Pass the audio stream
-            response_format="text",  # Return plain text
-            task="translate"         # Auto-translate non-English audio to English
-        )
-        
-        # 🧾 Return cleaned transcript
-        return response.strip()
\ No newline at end of file
+
+    # ⏱️ The request deadline scales with audio length (header read, nothing decoded)
+    if duration_seconds is None:
+        try:
+            duration_seconds = probe_audio(audio_path)[0]
+        except Exception as e:
+            print(f"⚠️ Could not read audio duration, using the maximum deadline: {e}")
+
+    # 🔁 Send file to OpenAI Whisper for transcription (English translation); the gateway
+    # paces the request and retries rate limits
+    response = get_openai_gateway().transcribe(
+        audio_path,
+        idempotent=True,         # Same chunk, same transcript: safe to hedge
+        duration_seconds=duration_seconds,
+        model="whisper-1",       # Use Whisper model
+        response_format="text",  # Return plain text
+        task="translate"         # Auto-translate non-English audio to English
+    )
+
+    # 🧾 Return cleaned transcript
+    return response.strip()
+
+
+# 📝 Transcribes one chunk (retries are owned by the OpenAI gateway, not repeated here)
+def _transcribe_chunk(index, total, chunk_path):
+    print(f"📝 Transcribing chunk {index}/{total}: {os.path.basename(chunk_path)}")
+    return transcribe_audio(chunk_path)
+
+
+# 🧩 Transcribes chunks concurrently and joins the transcripts in chunk order
+def transcribe_chunks(chunk_paths, max_workers=None):
+    max_workers = max_workers or TRANSCRIBE_MAX_WORKERS
+    total = len(chunk_paths)
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, total)),
+            thread_name_prefix="whisper",
+        ) as pool:
+            futures = [
+                pool.submit(_transcribe_chunk, i, total, path)
+                for i, path in enumerate(chunk_paths, start=1)
+            ]
+
+            # Collect in submission order so the transcript stays chronological,
+            # dropping text repeated in the overlap between neighbouring chunks
+            return stitch_transcripts([future.result() for future in futures])
+
+    # 🧹 Always remove the chunk files, even if a chunk failed for good
+    finally:
+        for path in chunk_paths:
+            if os.path.exists(path):
+                os.remove(path)
@@ -1,7 +1,8 @@
 import re
 import json
-from pydub import AudioSegment
 import os
+import subprocess
+import time
 
 
 # 🔍 Extracts the first JSON block from a string (e.g. GPT output)
@@ -23,53 +24,356 @@ def extract_json_block(text):
         raise ValueError("Response did not contain valid JSON.")
 
 
+# ⏱️ Duration from reading every audio packet (stream copy, nothing decoded), for
+# containers whose header has none, like browser-recorded .webm
+def _read_duration(audio_path):
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-nostats",
+            "-i", audio_path,
+            "-map", "0:a",
+            "-c", "copy",
+            "-f", "null",
+            "-progress", "pipe:1",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    duration = 0.0
+    for hours, minutes, seconds in re.findall(
+        r"^out_time=(\d+):(\d+):([\d.]+)$", result.stdout, re.MULTILINE
+    ):
+        duration = max(duration, int(hours) * 3600 + int(minutes) * 60 + float(seconds))
+    return duration
+
+
+# 🔎 Reads duration (seconds) and bitrate (bits/s) from the container header, falling
+# back to reading the packets when the header has no duration
+def probe_audio(audio_path):
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v", "error",
+            "-show_entries", "format=duration,bit_rate",
+            "-of", "json",
+            audio_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    fmt = json.loads(result.stdout).get("format", {})
+    try:
+        duration = float(fmt.get("duration") or 0)
+    except ValueError:
+        duration = 0.0  # "N/A"
+
+    if not duration:
+        duration = _read_duration(audio_path)
+
+    # Some containers omit bit_rate; derive it from file size and duration
+    bit_rate = fmt.get("bit_rate")
+    if bit_rate and bit_rate != "N/A":
+        bit_rate = int(bit_rate)
+    elif duration:
+        bit_rate = int(os.path.getsize(audio_path) * 8 / duration)
+    else:
+        bit_rate = 0
+
+    return duration, bit_rate
+
+
+# 🎛️ Output extension and ffmpeg encoder for each pre-compression format
+PRECOMPRESS_CODECS = {
+    "mp3": (".mp3", "libmp3lame"),
+    "opus": (".ogg", "libopus"),
+}
+
+
+# 🗜️ Downmixes to mono, resamples to 16 kHz and re-encodes at a speech-friendly bitrate
+def compress_audio(audio_path, audio_format="mp3", bitrate="32k"):
+    if audio_format not in PRECOMPRESS_CODECS:
+        raise ValueError(f"Unsupported pre-compression format: {audio_format}")
+
+    extension, codec = PRECOMPRESS_CODECS[audio_format]
+    output_path = f"{os.path.splitext(audio_path)[0]}_speech{extension}"
+    size_before = os.path.getsize(audio_path)
+    started = time.perf_counter()
+
+    try:
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel", "error",
+                "-y",
+                "-i", audio_path,
+                "-vn",
+                "-ac", "1",
+                "-ar", "16000",
+                "-c:a", codec,
+                "-b:a", bitrate,
+                output_path,
+            ],
+            check=True,
+        )
+
+    # 🧹 The caller only registers the output for cleanup on success
+    except subprocess.CalledProcessError:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+
+    size_after = os.path.getsize(output_path)
+    print(
+        f"🗜️ Pre-compressed audio: {round(size_before / 1024 / 1024, 2)}MB → "
+        f"{round(size_after / 1024 / 1024, 2)}MB in {round(time.perf_counter() - started, 1)}s"
+    )
+
+    # Keep the original if re-encoding did not help (already a low-bitrate file)
+    if size_after >= size_before:
+        os.remove(output_path)
+        print("ℹ️ Compressed file is not smaller — keeping the original.")
+        return audio_path
+
+    return output_path
+
+
+# 🚰 Same as compress_audio, but ffmpeg reads the recording from a byte stream (e.g. a
+# Drive download) so the original never lands on disk. Containers that need seeking
+# (m4a with its index at the end) fail here; callers fall back to a normal download.
+def compress_audio_stream(chunks, output_path, audio_format="mp3", bitrate="32k"):
+    if audio_format not in PRECOMPRESS_CODECS:
+        raise ValueError(f"Unsupported pre-compression format: {audio_format}")
+
+    extension, codec = PRECOMPRESS_CODECS[audio_format]
+    output_path = f"{os.path.splitext(output_path)[0]}{extension}"
+    started = time.perf_counter()
+    size_before = 0
+
+    process = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-y",
+            "-i", "pipe:0",
+            "-vn",
+            "-ac", "1",
+            "-ar", "16000",
+            "-c:a", codec,
+            "-b:a", bitrate,
+            output_path,
+        ],
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    try:
+        for chunk in chunks:
+            size_before += len(chunk)
+            process.stdin.write(chunk)
+    except BrokenPipeError:
+        pass  # ffmpeg gave up early; its exit code below explains why
+    finally:
+        process.stdin.close()
+
+    error = process.stderr.read().decode("utf-8", "replace")
+    if process.wait() != 0:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise subprocess.CalledProcessError(process.returncode, "ffmpeg", stderr=error)
+
+    size_after = os.path.getsize(output_path)
+    print(
+        f"🗜️ Stream-compressed audio: {round(size_before / 1024 / 1024, 2)}MB → "
+        f"{round(size_after / 1024 / 1024, 2)}MB in {round(time.perf_counter() - started, 1)}s"
+    )
+    return output_path
+
+
+# 🤫 Finds pauses with ffmpeg's silencedetect filter (streams the decode, constant memory)
+def detect_silences(audio_path, noise_db="-30dB", min_seconds=0.4):
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i", audio_path,
+            "-map", "0:a",
+            "-af", f"silencedetect=noise={noise_db}:d={min_seconds}",
+            "-f", "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    silences = []
+    start = None
+    for line in result.stderr.splitlines():
+        match = re.search(r"silence_start: (-?[\d.]+)", line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+
+        match = re.search(r"silence_end: ([\d.]+)", line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+
+    return silences
+
+
+# 📐 Picks chunk boundaries no longer than max_chunk_seconds, preferring the longest
+# pause in the last part of each chunk over a hard cut
+def plan_chunk_boundaries(duration, max_chunk_seconds, silences):
+    search_seconds = min(30.0, max_chunk_seconds * 0.2)
+    boundaries = [0.0]
+
+    while duration - boundaries[-1] > max_chunk_seconds:
+        target = boundaries[-1] + max_chunk_seconds
+        candidates = [
+            (end - start, (start + end) / 2)
+            for start, end in silences
+            if target - search_seconds <= (start + end) / 2 <= target
+        ]
+        boundaries.append(max(candidates)[1] if candidates else target)
+
+    boundaries.append(duration)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+# ✂️ Cuts one chunk straight from the source with stream copy (no re-encode)
+def _cut_audio(audio_path, start, duration, output_path):
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-y",
+            "-ss", f"{start:.3f}",
+            "-i", audio_path,
+            "-t", f"{duration:.3f}",
+            "-map", "0:a",
+            "-c", "copy",
+            output_path,
+        ],
+        check=True,
+    )
+
+
 # 🎧 Splits an audio file into multiple smaller chunks based on Whisper API's max file size
-def split_audio_file(audio_path, max_size_bytes=25 * 1024 * 1024):
+def split_audio_file(
+    audio_path,
+    max_size_bytes=25 * 1024 * 1024,
+    max_chunk_seconds=None,
+    overlap_seconds=None,
+):
+    from audio.config import (
+        AUDIO_CHUNK_SECONDS,
+        AUDIO_CHUNK_OVERLAP_SECONDS,
+        AUDIO_SILENCE_NOISE_DB,
+        AUDIO_SILENCE_MIN_SECONDS,
+    )
+
+    max_chunk_seconds = max_chunk_seconds or AUDIO_CHUNK_SECONDS
+    overlap = AUDIO_CHUNK_OVERLAP_SECONDS if overlap_seconds is None else overlap_seconds
+
     print("🔍 Determining optimal chunk size for Whisper API...")
 
-    # Load full audio file using pydub
-    audio = AudioSegment.from_file(audio_path)
-    duration_ms = len(audio)
-    base_name = os.path.splitext(audio_path)[0]
-    
-    # 🎯 Try different durations to find the largest that fits under the size limit
-    test_durations = [15 * 60 * 1000, 10 * 60 * 1000, 5 * 60 * 1000]    # in milliseconds
-
-    for test_duration in test_durations:
-        test_chunk = audio[:test_duration]
-        test_path = f"{base_name}_test_chunk.m4a"
-        test_chunk.export(test_path, format="mp4")
-        size = os.path.getsize(test_path)
-        os.remove(test_path)
-        
-        if size <= max_size_bytes:
-            chunk_length_ms = test_duration
-            break
-    
-    # 🕐 If none of the test durations work, fall back to 1-minute chunks and shrink until valid
+    # Duration and bitrate come from the container header — nothing is decoded
+    duration, bit_rate = probe_audio(audio_path)
+    if not duration:
+        raise ValueError(f"Could not determine the duration of {os.path.basename(audio_path)}")
+    base_name, extension = os.path.splitext(audio_path)
+    extension = extension or ".m4a"
+
+    # 🎯 Largest chunk length that fits the limit at this bitrate (5% container headroom)
+    if bit_rate:
+        chunk_seconds = int(max_size_bytes * 0.95 * 8 / bit_rate)
     else:
-        chunk_length_ms = 60 * 1000
-        while True:
-            test_chunk = audio[:chunk_length_ms]
-            test_path = f"{base_name}_test_chunk.m4a"
-            test_chunk.export(test_path, format="mp4")
-            
-            if os.path.getsize(test_path) > max_size_bytes:
-                chunk_length_ms -= 10 * 1000
-                os.remove(test_path)
-            
-            else:
-                os.remove(test_path)
-                break
-
-    # 🔪 Split full audio file into final chunks
-    chunks = []
-    for i in range(0, duration_ms, chunk_length_ms):
-        chunk = audio[i : i + chunk_length_ms]
-        chunk_path = f"{base_name}_part{i // chunk_length_ms}.m4a"
-        chunk.export(chunk_path, format="mp4")
-        chunks.append(chunk_path)
-
-    print(f"🧩 Final chunk size: {chunk_length_ms // 1000} seconds")
+        chunk_seconds = 15 * 60
+    if max_chunk_seconds:
+        chunk_seconds = min(chunk_seconds, max_chunk_seconds)
+    chunk_seconds = max(10, chunk_seconds)
+
+    # 🤫 Pauses near each target boundary keep words and sentences intact
+    silences = detect_silences(audio_path, AUDIO_SILENCE_NOISE_DB, AUDIO_SILENCE_MIN_SECONDS)
+
+    while True:
+        # The overlap is added in front of each chunk, so leave room for it
+        spans = plan_chunk_boundaries(duration, max(5, chunk_seconds - overlap), silences)
+        chunks = []
+        try:
+            for i, (start, end) in enumerate(spans):
+                cut_start = max(0.0, start - overlap) if i else start
+                chunk_path = f"{base_name}_part{i:03d}{extension}"
+                chunks.append(chunk_path)
+                _cut_audio(audio_path, cut_start, end - cut_start, chunk_path)
+
+            largest = max(os.path.getsize(chunk) for chunk in chunks)
+
+        # 🧹 The caller only learns the chunk paths on success, so clean up here
+        except Exception:
+            for chunk in chunks:
+                if os.path.exists(chunk):
+                    os.remove(chunk)
+            raise
+
+        if largest <= max_size_bytes or chunk_seconds <= 10:
+            break
+
+        # 📉 Variable bitrate pushed a chunk over the limit — shrink and cut again
+        for chunk in chunks:
+            os.remove(chunk)
+        chunk_seconds = max(10, int(chunk_seconds * max_size_bytes * 0.95 / largest))
+
+    print(f"🧩 Final chunk size: up to {chunk_seconds} seconds ({overlap}s overlap)")
     print(f"📂 Total chunks: {len(chunks)}")
-    return chunks
\ No newline at end of file
+    return chunks
+
+
+# 🔤 Lower-cases a word and strips punctuation so overlapping text can be compared
+def _normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+# 🧵 Joins chunk transcripts in order, dropping the words the next chunk repeats from
+# the overlap (tolerates a few garbled words at the very start of a chunk)
+def stitch_transcripts(transcripts, max_overlap_words=40, min_match_words=3):
+    stitched = []
+    previous_words = []
+
+    for text in transcripts:
+        words = text.split()
+
+        if previous_words and words:
+            tail = [_normalize_word(w) for w in previous_words[-max_overlap_words:]]
+            head = [_normalize_word(w) for w in words[: max_overlap_words + 3]]
+            drop = 0
+
+            for length in range(min(len(tail), len(head)), min_match_words - 1, -1):
+                for skip in range(0, min(3, len(head) - length) + 1):
+                    if head[skip : skip + length] == tail[-length:]:
+                        drop = skip + length
+                        break
+                if drop:
+                    break
+
+            if drop:
+                text = " ".join(words[drop:])
+                words = words[drop:]
+
+        if text:
+            stitched.append(text)
+        previous_words = words or previous_words
+
+    return "\n".join(stitched)
@@ -0,0 +1,145 @@
+# 📦 Standard Libraries
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tracemalloc
+
+# 📁 Project root, so `website.*` resolves however the script is started
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from website.extract import extract_page  # noqa: E402
+
+# 📚 Fixture pages committed next to this script (landing, services, windows-1252,
+# BOM without meta charset, page-builder blog post)
+DEFAULT_CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_corpus")
+BACKENDS = ("bs4", "lxml")
+
+# 🧪 HTML-to-text benchmark: throughput and peak memory of each extraction backend
+# over a corpus of saved pages, plus a check that both produce the same text.
+#
+#   python benchmarks/html_extract.py [corpus_dir] [--repeat 3]
+#   python benchmarks/html_extract.py .cache/html_corpus --save https://example.com
+
+
+# 📥 Downloads pages into the corpus through the same fetcher the pipeline uses
+def save_pages(urls, corpus_dir):
+    from website.fetch import fetch_url
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    for url in urls:
+        page = fetch_url(url)
+        name = "".join(c if c.isalnum() else "_" for c in url.split("://", 1)[-1])
+        path = os.path.join(corpus_dir, f"{name[:100]}.html")
+        with open(path, "wb") as f:
+            f.write(page.content)
+        print(f"💾 {url} → {path} ({len(page.content) // 1024} KB)")
+
+
+# 📚 (file name, raw bytes) of every page in the corpus
+def load_corpus(corpus_dir):
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+# ⏱️ Runs one backend over the corpus (called in a fresh interpreter per backend,
+# so peak RSS is not polluted by the other backend)
+def measure(backend, corpus_dir, repeat):
+    pages = load_corpus(corpus_dir)
+    extract_page(pages[0][1], backend=backend)  # Warm-up: imports and parser setup
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        for _, content in pages:
+            extract_page(content, backend=backend)
+
+    elapsed = time.perf_counter() - started
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    total_bytes = sum(len(content) for _, content in pages) * repeat
+    return {
+        "backend": backend,
+        "pages": len(pages) * repeat,
+        "seconds": elapsed,
+        "mb_per_second": total_bytes / 1024 / 1024 / elapsed if elapsed else 0.0,
+        "pages_per_second": len(pages) * repeat / elapsed if elapsed else 0.0,
+        "python_peak_mb": python_peak / 1024 / 1024,
+        # ru_maxrss is KB on Linux; growth covers native (libxml2) allocations too
+        "rss_growth_mb": max(0, rss_after - rss_before) / 1024,
+    }
+
+
+# 🔍 Pages whose extracted text or links differ between the two backends
+def compare_backends(pages):
+    mismatches = []
+    for name, content in pages:
+        results = [extract_page(content, backend=backend) for backend in BACKENDS]
+        if results[0] != results[1]:
+            lines = [set(text.splitlines()) for text, _ in results]
+            shared = len(lines[0] & lines[1]) / max(1, len(lines[0] | lines[1]))
+            mismatches.append((name, shared))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML-to-text backends.")
+    parser.add_argument("corpus_dir", nargs="?", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    parser.add_argument("--save", nargs="+", metavar="URL", help="add pages to the corpus")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages(args.save, args.corpus_dir)
+        return
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.corpus_dir, args.repeat)))
+        return
+
+    pages = load_corpus(args.corpus_dir) if os.path.isdir(args.corpus_dir) else []
+    if not pages:
+        print(f"⚠️ No .html files in {args.corpus_dir} — add some with --save URL ...")
+        return
+
+    corpus_mb = sum(len(content) for _, content in pages) / 1024 / 1024
+    print(f"📚 Corpus: {len(pages)} page(s), {corpus_mb:.1f} MB, {args.repeat} pass(es)\n")
+
+    for backend in BACKENDS:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), args.corpus_dir,
+             "--repeat", str(args.repeat), "--worker", backend],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print(f"   {backend:<5} failed: {result.stderr.strip().splitlines()[-1]}")
+            continue
+
+        r = json.loads(result.stdout.strip().splitlines()[-1])
+        print(
+            f"   {backend:<5} {r['mb_per_second']:7.2f} MB/s  {r['pages_per_second']:7.1f} pages/s  "
+            f"python peak {r['python_peak_mb']:6.1f} MB  RSS growth {r['rss_growth_mb']:6.1f} MB"
+        )
+
+    mismatches = compare_backends(pages)
+    print(f"\n🔍 Identical output on {len(pages) - len(mismatches)}/{len(pages)} page(s)")
+    for name, shared in mismatches:
+        print(f"   ≠ {name}: {shared:.0%} of distinct lines shared")
+
+
+if __name__ == "__main__":
+    main()
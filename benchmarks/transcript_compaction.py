@@ -0,0 +1,111 @@
+# 📦 Standard Libraries
+import os
+import re
+import sys
+import json
+import argparse
+
+# 📁 Project root, so `audio.*` resolves however the script is started
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from audio.compaction import compact_transcript  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compaction_corpus")
+
+# 🧪 Transcript compaction regression check. Every corpus case is a meeting transcript
+# plus the action items (owners, deadlines, figures) a summary must not lose:
+#
+#   python benchmarks/transcript_compaction.py              # compaction only, offline
+#   python benchmarks/transcript_compaction.py --summarize  # also compare GPT summaries
+#
+# Exits with status 1 if compaction removed any action item from a transcript.
+
+
+# 🔤 Lower case with punctuation and extra spaces removed, for phrase matching
+def _plain(text):
+    return " ".join(re.sub(r"[^\w%$/.,]+", " ", text.lower()).split())
+
+
+# 🔑 Words an action item has to keep in a summary (rephrasing is expected there)
+def _keywords(phrase):
+    return [word for word in re.findall(r"[\w%$,/]+", phrase.lower()) if len(word) > 3 or any(c.isdigit() for c in word)]
+
+
+# 📚 (name, case dict) of every case in the corpus
+def load_corpus(corpus_dir):
+    cases = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(".json"):
+            with open(os.path.join(corpus_dir, name), "r", encoding="utf-8") as f:
+                cases.append((name[: -len(".json")], json.load(f)))
+    return cases
+
+
+# 📝 Share of action items whose keywords (at least two thirds) appear in the summary
+def summary_coverage(summary, action_items):
+    text = _plain(json.dumps(summary, ensure_ascii=False))
+    found = 0
+    for item in action_items:
+        keywords = _keywords(item)
+        hits = sum(1 for keyword in keywords if keyword in text)
+        if keywords and hits * 3 >= len(keywords) * 2:
+            found += 1
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check transcript compaction against a corpus.")
+    parser.add_argument("corpus_dir", nargs="?", default=CORPUS_DIR)
+    parser.add_argument("--summarize", action="store_true", help="also summarize raw vs compacted (calls OpenAI)")
+    args = parser.parse_args()
+
+    failures = 0
+    totals = {False: [0, 0], True: [0, 0]}
+
+    for name, case in load_corpus(args.corpus_dir):
+        transcript, action_items = case["transcript"], case["action_items"]
+        print(f"📄 {name}")
+
+        for drop_low_info in (False, True):
+            compacted, stats = compact_transcript(transcript, drop_low_info=drop_low_info)
+            totals[drop_low_info][0] += stats["tokens_before"]
+            totals[drop_low_info][1] += stats["tokens_after"]
+
+            plain = _plain(compacted)
+            missing = [item for item in action_items if _plain(item) not in plain]
+            failures += len(missing)
+
+            mode = "drop low-info" if drop_low_info else "default      "
+            saved = 100 * (stats["tokens_before"] - stats["tokens_after"]) / stats["tokens_before"]
+            print(
+                f"   {mode} ~{stats['tokens_before']} → ~{stats['tokens_after']} tokens (-{saved:.0f}%)  "
+                f"action items kept {len(action_items) - len(missing)}/{len(action_items)}"
+            )
+            for item in missing:
+                print(f"      ❌ lost: {item}")
+
+        if args.summarize:
+            from audio.summarizer import generate_summary
+
+            compacted, _ = compact_transcript(transcript)
+            raw_found = summary_coverage(generate_summary(transcript), action_items)
+            compacted_found = summary_coverage(generate_summary(compacted), action_items)
+            print(
+                f"   summary action items: raw {raw_found}/{len(action_items)}, "
+                f"compacted {compacted_found}/{len(action_items)}"
+            )
+
+    for drop_low_info, (before, after) in totals.items():
+        mode = "drop low-info" if drop_low_info else "default"
+        if before:
+            print(f"\n🗜️ Corpus total ({mode}): ~{before} → ~{after} tokens (-{100 * (before - after) / before:.0f}%)")
+
+    if failures:
+        print(f"\n❌ {failures} action item(s) lost by compaction")
+        sys.exit(1)
+    print("\n✅ No action items lost")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,72 @@
 # 📦 Standard Libraries: built-in modules for OS and environment handling
 import os
+import hashlib
+import sys
+import tempfile
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 
 # 🌐 Third-Party Libraries: external dependencies (Google APIs, dotenv, etc.)
 from dotenv import load_dotenv
-import gspread
-from google.auth import default
 
 # 📊 Google Sheet Integration: functions to update summary results
-from utils.sheet_utils import update_sheet_with_links
+from utils.sheet_utils import (
+    update_sheet_with_links,
+    scan_pending_rows,
+    SheetWriteBuffer,
+)
+
+# 🏭 Pipeline Engine: bounded-queue stages with per-stage worker threads
+from utils.pipeline import Pipeline, Stage
+
+# ♻️ LLM Response Cache: reuse parsed GPT summaries for identical inputs
+from utils.llm_cache import get_response_cache
+
+# 🚦 OpenAI Gateway: shared rate limiting and retry for every OpenAI call
+from utils.openai_gateway import get_openai_gateway
+
+# 🧾 Checkpoint Ledger: per-row stage outputs, so reruns resume where a row failed
+from utils.checkpoints import get_checkpoint_ledger, row_key
 
 # 🌐 Website Summarization Modules: extract and summarize website content
-from website.extract import extract_text_from_url
+from website.crawl import crawl_site
+from website.fetch import prefetch_ahead, discard_page
 from website.summarize import summarize_with_openai
 from website.document import create_docx_in_memory as create_website_doc
-from website.drive import upload_docx_to_gdrive
+from website.drive import upload_docx_to_gdrive, find_uploaded_website_doc
 
 # 🎧 Audio Summarization Modules: transcribe and summarize meeting audio
-from audio.transcription import transcribe_audio
+from audio.transcription import transcribe_audio, transcribe_chunks
 from audio.summarizer import generate_summary
+from audio.compaction import compact_transcript
 from audio.doc_generator import generate_docx as create_audio_doc
 from audio.drive_utils import (
     upload_file_to_drive_in_memory,
-    download_audio_from_drive,
-    find_audio_file_in_folder,
+    find_audio_files_info_in_folder,
+    find_audio_files_in_folders,
     find_folder_id_by_partial_name,
+    find_uploaded_audio_doc,
+)
+from audio.config import (
+    AUDIO_DRIVE_FOLDER_ID,
+    AUDIO_PRECOMPRESS,
+    AUDIO_PRECOMPRESS_FORMAT,
+    AUDIO_PRECOMPRESS_BITRATE,
+    AUDIO_CHUNK_SECONDS,
+    AUDIO_EXTENSIONS,
+    AUDIO_INGEST_MODE,
+    RECORDING_MAX_WORKERS,
+    AUDIO_STREAM_TO_FFMPEG,
+    TRANSCRIPT_COMPACTION,
 )
-from audio.config import AUDIO_DRIVE_FOLDER_ID
-from audio.utils import split_audio_file
+from audio.utils import (
+    split_audio_file,
+    compress_audio,
+    compress_audio_stream,
+    probe_audio,
+)
+from audio.download import temporary_download, iter_drive_file, remove_file
+from audio.transcript_cache import get_transcript_cache
 
 # 🔐 Load environment variables from .env file
 load_dotenv()
@@ -46,175 +86,613 @@ def extract_drive_folder_id(link):
         return None
 
 
-# 📥 Fetches all rows from the configured Google Sheet using service account credentials
-def get_all_rows():
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds, _ = default(scopes=scope)  # ✅ Uses Cloud Run attached service account
-    client = gspread.authorize(creds)
-    sheet = client.open_by_key(os.getenv("GOOGLE_SHEET_ID")).sheet1
-    return sheet.get_all_values(), sheet
+# ⚙️ Worker count for a pipeline stage (override with PIPELINE_WORKERS_<STAGE>)
+def stage_workers(name, default):
+    return int(os.getenv(f"PIPELINE_WORKERS_{name.upper()}", default))
 
 
-# 🚀 Main orchestration function: processes each row in the Google Sheet
-def main():
-    print("📦 SmartSummarizer")  # Starting point of the script
+# 📦 Max number of rows waiting between two stages (bounded queues)
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "2"))
 
-    # Get all rows from the Google Sheet
-    rows, sheet = get_all_rows()
-    processed_count = 0
-
-    print(f"📊 Total Rows: {len(rows) - 1}")
-
-    # Iterate through each row in the sheet
-    for idx, row in enumerate(rows[1:], start=2):
-        meeting_date = row[0].strip() if len(row) > 0 else ""
-        company_name = row[1].strip() if len(row) > 1 else ""
-        website_url = row[4].strip() if len(row) > 4 else ""
-        audio_folder_link = row[5].strip() if len(row) > 5 else ""
-        status = row[8].strip().lower() if len(row) > 8 else ""
-
-        print(f"\n🔍 Row {idx} — Status  : {status or '[empty]'}")
-        print(f"   📅 Date         : {meeting_date or '[MISSING]'}")
-        print(f"   🏢 Company Name : {company_name or '[MISSING]'}")
-        print(f"   🌐 Website Link : {website_url or '[MISSING]'}")
-        print(f"   🎧 Audio Folder : {audio_folder_link or '[MISSING]'}")
-
-        # Skip if row already marked as "done"
-        if status == "done":
-            print(f"✅ Skipped: Already marked as Done.")
-            continue
 
-        # If audio folder is missing, try to auto-fill based on company name
-        if not audio_folder_link:
-            parent_drive_folder = os.getenv("AUDIO_PARENT_FOLDER_ID")
-            folder_id = find_folder_id_by_partial_name(
-                company_name, parent_drive_folder
+# 🧾 Audio stages a checkpoint from an earlier run makes unnecessary
+RESUMED_STAGES = {
+    "transcript": ("download", "prep", "transcribe"),
+    "summary": ("download", "prep", "transcribe", "compact", "summarize"),
+    "audio_upload": ("download", "prep", "transcribe", "compact", "summarize", "render", "upload"),
+}
+
+
+# 🧯 Wraps an audio stage: skip it after an earlier audio failure or when a checkpoint
+# already covers it, record new failures
+def audio_step(func, stage):
+    def run(job):
+        if job.get("audio_error") or stage in job.get("resumed_stages", ()):
+            return job
+
+        try:
+            func(job)
+        except Exception as e:
+            print(f"❌ Row {job['row_index']} audio processing failed: {e}")
+            job["audio_error"] = e
+
+        return job
+
+    return run
+
+
+# 📥 Stage 1 (Drive fetch): resolve the audio folder, validate, and download the recording
+def fetch_stage(job, sheet_writer, website_pool):
+    idx = job["row_index"]
+
+    # If audio folder is missing, try to auto-fill based on company name
+    if not job["audio_folder_link"]:
+        parent_drive_folder = os.getenv("AUDIO_PARENT_FOLDER_ID")
+        folder_id = find_folder_id_by_partial_name(
+            job["company_name"], parent_drive_folder
+        )
+
+        # Auto-fill audio folder link if missing
+        if folder_id:
+            job["audio_folder_link"] = (
+                f"https://drive.google.com/drive/folders/{folder_id}?usp=sharing"
             )
+            sheet_writer.add(idx, 6, job["audio_folder_link"])
+
+        else:
+            print(f"❌ Could not auto-fill Audio Folder Link for: {job['company_name']}")
+            print(f"⛔ Skipping Row {idx} — Required audio folder is missing.")
+            discard_page(job["website_url"])
+            return None
 
-            # Auto-fill audio folder link if missing
-            if folder_id:
-                audio_folder_link = (
-                    f"https://drive.google.com/drive/folders/{folder_id}?usp=sharing"
-                )
-                sheet.update_cell(idx, 6, audio_folder_link)
+    # Validate required fields
+    if (
+        not job["meeting_date"]
+        or not job["company_name"]
+        or not job["website_url"]
+        or not job["audio_folder_link"]
+    ):
+        print(f"⛔ Skipping Row {idx} — One or more required fields are missing.")
+        discard_page(job["website_url"])
+        return None
 
-            else:
-                print(f"❌ Could not auto-fill Audio Folder Link for: {company_name}")
-                print(f"⛔ Skipping Row {idx} — Required audio folder is missing.")
-                continue
-
-        # Validate required fields
-        if (
-            not meeting_date
-            or not company_name
-            or not website_url
-            or not audio_folder_link
-        ):
-            print(f"⛔ Skipping Row {idx} — One or more required fields are missing.")
-            continue
+    print(f"✅ Row {idx} passed validation. Beginning summarization...")
+    restore_checkpoints(job)
 
-        print(f"✅ Row {idx} passed validation. Beginning summarization...")
+    # 🌐 The website branch shares nothing with the audio branch until write-back
+    job["website_future"] = website_pool.submit(website_branch, job)
+    return audio_step(download_stage, "download")(job)
 
-        # Prepare output filenames
-        website_filename = f"{company_name} Website Summary.docx"
-        audio_filename = f"{company_name} Meeting Notes.docx"
-        website_link_result = None
-        audio_link_result = None
 
-        # 🌐 Website Summarization
+# 🧬 What a checkpoint was built from: the audio folder and its recordings for audio
+# stages, the website URL for website stages
+def checkpoint_source(job, stage):
+    if stage in RESUMED_STAGES:
+        return {
+            "audio_folder_link": job["audio_folder_link"],
+            "recordings": recordings_fingerprint(job),
+        }
+    return {"website_url": job["website_url"]}
+
+
+# 💾 Record a stage's output in the ledger, together with the inputs it came from
+def save_checkpoint(job, stage, value):
+    ledger = get_checkpoint_ledger()
+    if ledger:
+        ledger.save(job["checkpoint_key"], stage, dict(value, **checkpoint_source(job, stage)))
+
+
+# ✔️ Checkpoints of the row whose inputs are unchanged since they were recorded
+def valid_checkpoints(job, stages):
+    valid = {}
+    for stage, value in job.get("checkpoints", {}).items():
+        if stage not in stages:
+            continue
         try:
-            print(f"🌐 Extracting and summarizing website: {website_url}")
-            raw_text = extract_text_from_url(website_url)
-            summary = summarize_with_openai(raw_text)
-            doc_stream = create_website_doc(summary, f"{company_name} Website Summary")
-            drive_file_id = upload_docx_to_gdrive(doc_stream, website_filename)
-            website_link_result = (
-                f"https://drive.google.com/file/d/{drive_file_id}/view"
+            source = checkpoint_source(job, stage)
+        except Exception as e:
+            print(f"⚠️ Row {job['row_index']}: cannot check checkpoint '{stage}': {e}")
+            continue
+        if all(value.get(field) == expected for field, expected in source.items()):
+            valid[stage] = value
+        else:
+            print(f"♻️ Row {job['row_index']}: inputs changed, ignoring checkpoint '{stage}'")
+    return valid
+
+
+# 🏷️ appProperties tagging an upload with the row and document it belongs to (meeting
+# notes also with their recordings, so notes from an older set are never reused)
+def upload_tags(job, document):
+    tags = {"fmsRow": job["checkpoint_key"], "fmsDoc": document}
+    if document == "meeting_notes":
+        tags["fmsSource"] = extract_drive_folder_id(job["audio_folder_link"])
+        recordings = "\n".join(recordings_fingerprint(job))
+        tags["fmsAudio"] = hashlib.sha1(recordings.encode("utf-8")).hexdigest()[:16]
+    return tags
+
+
+# ⏩ Resume the audio branch after its furthest checkpoint from an earlier run (only
+# if the folder still holds the same recordings); website checkpoints are read by its
+# branch
+def restore_checkpoints(job):
+    ledger = get_checkpoint_ledger()
+    job["checkpoints"] = ledger.load(job["checkpoint_key"]) if ledger else {}
+
+    audio = valid_checkpoints(job, RESUMED_STAGES)
+    resumed = None
+
+    if "audio_upload" in audio:
+        file_id = find_uploaded_audio_doc(
+            AUDIO_DRIVE_FOLDER_ID, None, known_id=audio["audio_upload"]["file_id"]
+        )
+        if file_id:
+            job["audio_link_result"] = f"https://drive.google.com/file/d/{file_id}/view"
+            resumed = "audio_upload"
+
+    if not resumed and "summary" in audio:
+        job["summary_data"] = audio["summary"]["summary"]
+        resumed = "summary"
+
+    if not resumed and "transcript" in audio:
+        job["transcript"] = audio["transcript"]["transcript"]
+        resumed = "transcript"
+
+    if resumed:
+        job["resumed_stages"] = RESUMED_STAGES[resumed]
+        print(f"⏩ Row {job['row_index']}: resuming after checkpoint '{resumed}'")
+
+
+# 🧵 Applies func to each recording of a row concurrently (results keep recording order)
+def for_each_recording(func, recordings):
+    if len(recordings) == 1:
+        return [func(recordings[0])]
+
+    with ThreadPoolExecutor(
+        max_workers=min(RECORDING_MAX_WORKERS, len(recordings)),
+        thread_name_prefix="recording",
+    ) as pool:
+        return list(pool.map(func, recordings))
+
+
+# ⬇️ Download one recording unless its transcript is already cached; temp files are
+# registered on the row's cleanup stack so they go away even if a later stage fails
+def download_recording(recording, cleanup):
+    audio_file = recording["file"]
+
+    # ♻️ Unchanged recording already transcribed on an earlier run: skip download and Whisper
+    cache = get_transcript_cache()
+    if cache:
+        recording["transcript"] = cache.get(audio_file.get("md5Checksum"), audio_file.get("size"))
+        if recording["transcript"] is not None:
+            print(f"♻️ Using cached transcript for {audio_file['name']}")
+            return
+
+    suffix = os.path.splitext(audio_file["name"])[1].lower() or ".m4a"
+
+    # 🚰 Compress straight from the Drive stream; the original never lands on disk
+    if AUDIO_PRECOMPRESS and AUDIO_STREAM_TO_FFMPEG:
+        fd, stream_target = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        os.remove(stream_target)
+        try:
+            recording["path"] = compress_audio_stream(
+                iter_drive_file(audio_file["id"]),
+                stream_target,
+                audio_format=AUDIO_PRECOMPRESS_FORMAT,
+                bitrate=AUDIO_PRECOMPRESS_BITRATE,
             )
-            print(f"✅ Website uploaded: {website_link_result}")
+            cleanup.callback(remove_file, recording["path"])
+            recording["compressed"] = True
+            return
 
         except Exception as e:
-            print(f"❌ Website processing failed: {e}")
+            print(f"⚠️ Streaming compression failed, downloading instead: {e}")
+
+    recording["path"] = cleanup.enter_context(
+        temporary_download(audio_file["id"], suffix=suffix, size=audio_file.get("size"))
+    )
+
+
+# 🎧 The row's recordings in its Drive folder, resolved once per row (by the
+# checkpoint check or the download stage, whichever needs them first)
+def resolve_recordings(job):
+    if "recording_files" in job:
+        return job["recording_files"]
+
+    folder_id = extract_drive_folder_id(job["audio_folder_link"])
+
+    if not folder_id:
+        raise Exception("Invalid or missing folder ID.")
+
+    # Rows with a folder link were resolved up front in one batch; auto-filled ones weren't
+    if "audio_files" in job:
+        audio_files = job["audio_files"]
+    else:
+        audio_files = find_audio_files_info_in_folder(folder_id, AUDIO_EXTENSIONS)
+
+    if not audio_files:
+        raise Exception(f"No {'/'.join(AUDIO_EXTENSIONS)} file found in folder.")
+
+    # A meeting can be split over several uploads (dropped call, part 2, ...)
+    if AUDIO_INGEST_MODE == "first":
+        audio_files = audio_files[:1]
+
+    job["recording_files"] = audio_files
+    return audio_files
 
-        # 🎧 Audio Summarization
+
+# 🔑 Sorted md5s of the recordings the row's audio outputs are built from, so adding
+# or replacing a recording in the folder invalidates them
+def recordings_fingerprint(job):
+    return sorted(
+        audio_file.get("md5Checksum") or f"{audio_file['id']}:{audio_file.get('size')}"
+        for audio_file in resolve_recordings(job)
+    )
+
+
+# ⬇️ Find the row's recordings in its Drive folder and download them concurrently
+def download_stage(job):
+    print(f"🎧 Searching audio folder: {job['audio_folder_link']}")
+    audio_files = resolve_recordings(job)
+
+    if len(audio_files) > 1:
+        print(f"🎧 {len(audio_files)} recordings found — merging them in recording order.")
+
+    job["recordings"] = [
+        {"file": audio_file, "path": None, "duration": None, "chunks": None, "transcript": None}
+        for audio_file in audio_files
+    ]
+    for_each_recording(
+        lambda recording: download_recording(recording, job["cleanup"]), job["recordings"]
+    )
+
+
+# 🪚 Optionally shrink one recording for speech, then split it if it's over the
+# Whisper 25MB limit
+def prep_recording(recording, cleanup):
+    if recording["transcript"] is not None:
+        return
+
+    if AUDIO_PRECOMPRESS and not recording.get("compressed"):
         try:
-            print(f"🎧 Searching audio folder: {audio_folder_link}")
-            folder_id = extract_drive_folder_id(audio_folder_link)
+            compressed_path = compress_audio(
+                recording["path"],
+                audio_format=AUDIO_PRECOMPRESS_FORMAT,
+                bitrate=AUDIO_PRECOMPRESS_BITRATE,
+            )
+            if compressed_path != recording["path"]:
+                cleanup.callback(remove_file, compressed_path)
+                remove_file(recording["path"])
+                recording["path"] = compressed_path
 
-            if not folder_id:
-                raise Exception("Invalid or missing folder ID.")
+        except Exception as e:
+            print(f"⚠️ Pre-compression failed, using original audio: {e}")
 
-            file_id = find_audio_file_in_folder(folder_id, extension=".m4a")
-            if not file_id:
-                raise Exception("No .m4a file found in folder.")
+    audio_path = recording["path"]
+    audio_size_bytes = os.path.getsize(audio_path)
 
-            print("🎙️ Transcribing and summarizing audio...")
-            audio_path = download_audio_from_drive(file_id)
-            transcript = ""
-            audio_size_bytes = os.path.getsize(audio_path)
+    # Duration from the container header, for the chunk length cap and the Whisper
+    # deadline (None when it can't be read)
+    try:
+        recording["duration"] = probe_audio(audio_path)[0] or None
+    except Exception as e:
+        print(f"⚠️ Could not read audio duration: {e}")
+        recording["duration"] = None
+
+    # Use direct transcription if file is under 25MB (and under the chunk length cap)
+    if audio_size_bytes <= 25 * 1024 * 1024 and (
+        not AUDIO_CHUNK_SECONDS or (recording["duration"] or 0) <= AUDIO_CHUNK_SECONDS
+    ):
+        recording["chunks"] = None
+
+    # # Split large audio into smaller chunks
+    else:
+        print(
+            f"📦 Audio is {round(audio_size_bytes / 1024 / 1024, 2)}MB — splitting for transcription."
+        )
+        recording["chunks"] = split_audio_file(audio_path)
+        for chunk_path in recording["chunks"]:
+            cleanup.callback(remove_file, chunk_path)
+
+
+# 🪚 Stage 2 (audio prep): prepare every recording of the row
+def prep_stage(job):
+    for_each_recording(
+        lambda recording: prep_recording(recording, job["cleanup"]), job["recordings"]
+    )
+
+
+# 🎙️ Transcribe one recording (or each of its chunks) and cache the result
+def transcribe_recording(recording):
+    if recording["transcript"] is not None:
+        return
+
+    chunks = recording["chunks"]
+
+    if not chunks:
+        print("🎙️ Transcribing with OpenAI Whisper API (single file)...")
+        recording["transcript"] = transcribe_audio(
+            recording["path"], duration_seconds=recording.get("duration")
+        )
+
+    # Transcribe chunks concurrently; the transcript comes back in chunk order
+    else:
+        recording["transcript"] = transcribe_chunks(chunks)
+
+    # 🗂️ Keep the transcript so a later failure doesn't cost another Whisper run
+    cache = get_transcript_cache()
+    if cache:
+        audio_file = recording["file"]
+        cache.put(audio_file.get("md5Checksum"), audio_file.get("size"), recording["transcript"])
+
+
+# 🎙️ Stage 3 (Whisper transcription): transcribe all recordings concurrently and join
+# them in recording order
+def transcribe_stage(job):
+    for_each_recording(transcribe_recording, job["recordings"])
+    job["transcript"] = "\n\n".join(
+        recording["transcript"] for recording in job["recordings"] if recording["transcript"]
+    )
+    save_checkpoint(job, "transcript", {"transcript": job["transcript"]})
+
+
+# 🗜️ Stage 3b (compaction): strip fillers and repeats so the summary call pays for
+# fewer input tokens
+def compact_stage(job):
+    if not TRANSCRIPT_COMPACTION:
+        return
+
+    job["transcript"], stats = compact_transcript(job["transcript"])
+    job["compaction"] = stats
+
+    before, after = stats["tokens_before"], stats["tokens_after"]
+    saved = round(100 * (before - after) / before) if before else 0
+    print(
+        f"🗜️ Row {job['row_index']} transcript compacted: ~{before} → ~{after} tokens "
+        f"(-{saved}%, {stats['fillers_removed']} filler(s), "
+        f"{stats['words_deduplicated']} repeated word(s), "
+        f"{stats['sentences_dropped']} sentence(s) dropped)"
+    )
+
+
+# 🧠 Stage 4 (GPT summarization): structured meeting summary from the transcript
+def summarize_stage(job):
+    job["summary_data"] = generate_summary(job["transcript"])
+    save_checkpoint(job, "summary", {"summary": job["summary_data"]})
+
+
+# 📝 Stage 5 (DOCX render): build the meeting notes document
+def render_stage(job):
+    job["docx_file"] = create_audio_doc(
+        job["summary_data"], job["company_name"], job["meeting_date"]
+    )
+
+
+# 📤 Stage 6 (Drive upload): upload the meeting notes and drop the local recordings;
+# notes an earlier run uploaded but never recorded are reused instead of duplicated
+def upload_stage(job):
+    tags = upload_tags(job, "meeting_notes")
+    file_id_uploaded = find_uploaded_audio_doc(AUDIO_DRIVE_FOLDER_ID, tags)
+
+    if file_id_uploaded:
+        print(f"♻️ Reusing meeting notes uploaded by an earlier run: {file_id_uploaded}")
+    else:
+        file_id_uploaded = upload_file_to_drive_in_memory(
+            job["docx_file"],
+            folder_id=AUDIO_DRIVE_FOLDER_ID,
+            final_name=job["audio_filename"],
+            app_properties=tags,
+        )
+    save_checkpoint(job, "audio_upload", {"file_id": file_id_uploaded})
+    job["audio_link_result"] = (
+        f"https://drive.google.com/file/d/{file_id_uploaded}/view"
+    )
+    job["cleanup"].close()
+    print(f"✅ Audio uploaded: {job['audio_link_result']}")
+
+
+# 🌐 Website Summarization: extract, summarize, render and upload the website summary,
+# resuming from the row's website checkpoints when an earlier run got that far
+def website_branch(job):
+    company_name = job["company_name"]
+    website_url = job["website_url"]
+    saved = valid_checkpoints(job, ("website_summary", "website_upload"))
+    tags = upload_tags(job, "website_summary")
 
-            # Use direct transcription if file is under 25MB
-            if audio_size_bytes <= 25 * 1024 * 1024:
-                print("🎙️ Transcribing with OpenAI Whisper API (single file)...")
-                transcript = transcribe_audio(audio_path)
+    try:
+        drive_file_id = find_uploaded_website_doc(
+            tags, known_id=saved.get("website_upload", {}).get("file_id")
+        )
 
-            # # Split large audio into smaller chunks
+        if drive_file_id:
+            print(f"♻️ Reusing website summary uploaded by an earlier run: {drive_file_id}")
+        else:
+            if "website_summary" in saved:
+                summary = saved["website_summary"]["summary"]
             else:
-                print(
-                    f"📦 Audio is {round(audio_size_bytes / 1024 / 1024, 2)}MB — splitting for transcription."
-                )
-                chunks = split_audio_file(audio_path)
-                all_transcripts = []
-
-                # Transcribe each chunk individually
-                for i, chunk_path in enumerate(chunks, start=1):
-                    print(
-                        f"📝 Transcribing chunk {i}/{len(chunks)}: {os.path.basename(chunk_path)}"
-                    )
-                    chunk_transcript = transcribe_audio(chunk_path)
-                    all_transcripts.append(chunk_transcript)
-                    os.remove(chunk_path)
-
-                transcript = "\n".join(all_transcripts)
-
-            # Summarize and export audio content
-            summary_data = generate_summary(transcript)
-            docx_file = create_audio_doc(summary_data, company_name, meeting_date)
-            file_id_uploaded = upload_file_to_drive_in_memory(
-                docx_file,
-                folder_id=AUDIO_DRIVE_FOLDER_ID,
-                final_name=audio_filename,
-            )
-            audio_link_result = (
-                f"https://drive.google.com/file/d/{file_id_uploaded}/view"
+                print(f"🌐 Extracting and summarizing website: {website_url}")
+                raw_text = crawl_site(website_url)
+                summary = summarize_with_openai(raw_text)
+                # The "Summary Unavailable" fallback is worth another try next run
+                if summary.get("title") != "Summary Unavailable":
+                    save_checkpoint(job, "website_summary", {"summary": summary})
+
+            doc_stream = create_website_doc(summary, f"{company_name} Website Summary")
+            drive_file_id = upload_docx_to_gdrive(
+                doc_stream, job["website_filename"], app_properties=tags
             )
-            os.remove(audio_path)
-            print(f"✅ Audio uploaded: {audio_link_result}")
 
+        save_checkpoint(job, "website_upload", {"file_id": drive_file_id})
+        website_link_result = f"https://drive.google.com/file/d/{drive_file_id}/view"
+        print(f"✅ Website uploaded: {website_link_result}")
+        return website_link_result
+
+    except Exception as e:
+        print(f"❌ Website processing failed: {e}")
+        return None
+
+    # 🪟 A resumed or failed row never picks up its look-ahead page; free its slot
+    finally:
+        discard_page(website_url)
+
+
+# ✅ Stage 7 (sheet write-back): join the website branch, then update the Google Sheet
+# if any file was successfully uploaded
+def writeback_stage(job, sheet_writer):
+    idx = job["row_index"]
+
+    # 🧹 Whatever happened to the audio branch, its temp files go now
+    job["cleanup"].close()
+
+    website_future = job.get("website_future")
+    website_link_result = website_future.result() if website_future else None
+    audio_link_result = job.get("audio_link_result")
+
+    if website_link_result or audio_link_result:
+        update_sheet_with_links(
+            row_index=idx,
+            meeting_url=audio_link_result,
+            meeting_name=job["audio_filename"],
+            website_url=website_link_result,
+            website_name=job["website_filename"],
+            buffer=sheet_writer,
+        )
+        print(f"✅ Row {idx} queued for sheet update and marked as 'Done'.")
+        job["done"] = True
+
+    else:
+        print(f"⚠️ Row {idx}: No uploads succeeded. Row not marked as Done.")
+
+    return job
+
+
+# 📋 Yields a job for every new or changed row that is not yet marked as Done
+def pending_jobs(rows):
+    for row in rows:
+        idx = row.row_index
+
+        print(f"\n🔍 Row {idx} — Status  : {row.status or '[empty]'}")
+        print(f"   📅 Date         : {row.meeting_date or '[MISSING]'}")
+        print(f"   🏢 Company Name : {row.company_name or '[MISSING]'}")
+        print(f"   🌐 Website Link : {row.website_url or '[MISSING]'}")
+        print(f"   🎧 Audio Folder : {row.audio_folder_link or '[MISSING]'}")
+
+        # Prepare output filenames
+        yield {
+            "row_index": idx,
+            "meeting_date": row.meeting_date,
+            "company_name": row.company_name,
+            "website_url": row.website_url,
+            "audio_folder_link": row.audio_folder_link,
+            "website_filename": f"{row.company_name} Website Summary.docx",
+            "audio_filename": f"{row.company_name} Meeting Notes.docx",
+            "cleanup": ExitStack(),  # Temp files of this row, removed at write-back
+            "checkpoint_key": row_key(
+                idx, row.meeting_date, row.company_name, row.website_url
+            ),
+        }
+
+
+# 📬 Resolves the audio file of every job with a folder link in batched Drive requests
+def prefetch_audio_files(jobs):
+    jobs = list(jobs)
+    folder_ids = {}
+    for job in jobs:
+        folder_id = extract_drive_folder_id(job["audio_folder_link"])
+        if folder_id:
+            folder_ids[job["row_index"]] = folder_id
+
+    if folder_ids:
+        try:
+            found = find_audio_files_in_folders(folder_ids.values(), AUDIO_EXTENSIONS)
+            for job in jobs:
+                folder_id = folder_ids.get(job["row_index"])
+                if folder_id in found:
+                    job["audio_files"] = found[folder_id]
+
+        # Discovery falls back to one lookup per row in the fetch stage
         except Exception as e:
-            print(f"❌ Audio processing failed: {e}")
-
-        # ✅ Update the Google Sheet if any file was successfully uploaded
-        if website_link_result or audio_link_result:
-            update_sheet_with_links(
-                row_index=idx,
-                meeting_url=audio_link_result,
-                meeting_name=audio_filename,
-                website_url=website_link_result,
-                website_name=website_filename,
+            print(f"⚠️ Batched audio discovery failed: {e}")
+
+    return jobs
+
+
+# 🌍 Queues every valid row's website for background fetching (a bounded window of
+# rows ahead at a time), so pages are usually downloaded when the website branch of
+# each row reaches extraction
+def prefetch_websites(jobs):
+    prefetch_ahead(
+        job["website_url"]
+        for job in jobs
+        if job["meeting_date"] and job["company_name"] and job["website_url"]
+    )
+    return jobs
+
+
+# 🏭 Builds the row pipeline: each stage has its own workers and a bounded inbox
+def build_pipeline(sheet_writer, website_pool):
+    stages = [
+        ("fetch", lambda job: fetch_stage(job, sheet_writer, website_pool), 2),
+        ("prep", audio_step(prep_stage, "prep"), 1),
+        ("transcribe", audio_step(transcribe_stage, "transcribe"), 2),
+        ("compact", audio_step(compact_stage, "compact"), 1),
+        ("summarize", audio_step(summarize_stage, "summarize"), 2),
+        ("render", audio_step(render_stage, "render"), 1),
+        ("upload", audio_step(upload_stage, "upload"), 2),
+        ("writeback", lambda job: writeback_stage(job, sheet_writer), 1),
+    ]
+    return Pipeline(
+        [
+            Stage(name, func, stage_workers(name, default), PIPELINE_QUEUE_SIZE)
+            for name, func, default in stages
+        ],
+        # A row that drops out of the pipeline on an error still cleans up its temp files
+        on_error=lambda stage, job, error: job["cleanup"].close(),
+    )
+
+
+# 🚀 Main orchestration function: streams pending rows through the stage pipeline
+def main():
+    print("📦 SmartSummarizer")  # Starting point of the script
+
+    # Scan the Google Sheet incrementally: Done history is checked via its status column only
+    rows, total_rows = scan_pending_rows()
+
+    print(f"📊 Total Rows: {total_rows}")
+
+    # 🧺 Sheet cell updates from all rows are batched and flushed at shutdown at the latest
+    sheet_writer = SheetWriteBuffer()
+
+    # Row N+1 downloads while row N is transcribing; each row's website branch
+    # runs alongside its audio stages on a separate pool
+    try:
+        with ThreadPoolExecutor(
+            max_workers=stage_workers("website", 2), thread_name_prefix="website"
+        ) as website_pool:
+            pipeline = build_pipeline(sheet_writer, website_pool)
+            results = pipeline.run(
+                prefetch_websites(prefetch_audio_files(pending_jobs(rows)))
             )
-            print(f"✅ Row {idx} updated in sheet and marked as 'Done'.")
-            processed_count += 1
+    finally:
+        sheet_writer.close()
 
-        else:
-            print("⚠️ No uploads succeeded. Row not marked as Done.")
+    processed_count = sum(1 for job in results if job.get("done"))
 
+    pipeline.print_report()
+
+    cache = get_response_cache()
+    if cache:
+        stats = cache.stats()
+        print(f"♻️ LLM response cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+    get_openai_gateway().print_stats()
     print(f"\n📊 Summary: {processed_count} row(s) processed and marked as Done.")
 
 
 if __name__ == "__main__":
-    main()
+    # ⏱️ `python main.py --startup-profile` prints an import-time breakdown instead
+    if "--startup-profile" in sys.argv:
+        from utils.startup_profile import print_startup_profile
+
+        print_startup_profile()
+    else:
+        main()
@@ -0,0 +1,97 @@
+# 📦 Standard Libraries
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
+
+# 🔐 Load environment variables
+load_dotenv()
+
+# ⚙️ Config: on/off, database location and how long a row's checkpoints stay usable
+CHECKPOINT_LEDGER = os.getenv("CHECKPOINT_LEDGER", "true").lower() == "true"
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", ".cache/checkpoints.sqlite3")
+CHECKPOINT_TTL_SECONDS = float(os.getenv("CHECKPOINT_TTL_HOURS", "168")) * 3600
+
+
+# 🔑 Stable identity of a sheet row across runs: its position plus the fields that
+# define the job (not the status or the auto-filled folder link, which change)
+def row_key(row_index, meeting_date, company_name, website_url):
+    content = "\x1f".join([meeting_date, company_name, website_url])
+    return f"{row_index}-{hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]}"
+
+
+# 🧾 Durable per-row, per-stage record of finished work (transcript, summaries, Drive
+# file IDs) so a rerun resumes after the last completed stage instead of redoing it
+class CheckpointLedger:
+    def __init__(self, path, ttl_seconds):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # One connection shared by all pipeline threads, serialised by the lock
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                row_key    TEXT NOT NULL,
+                stage      TEXT NOT NULL,
+                value      TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (row_key, stage)
+            )
+            """
+        )
+        self.prune()
+
+    # 📋 {stage: value} of everything recorded for a row
+    def load(self, key):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT stage, value FROM checkpoints WHERE row_key = ? AND updated_at >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchall()
+        return {stage: json.loads(value) for stage, value in rows}
+
+    # 💾 Record (or replace) one stage's output; committed immediately
+    def save(self, key, stage, value):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (row_key, stage, value, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, stage, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+
+    # 🧹 Drop checkpoints older than the TTL
+    def prune(self):
+        with self._lock:
+            deleted = self._db.execute(
+                "DELETE FROM checkpoints WHERE updated_at < ?",
+                (time.time() - self.ttl_seconds,),
+            ).rowcount
+        if deleted:
+            print(f"🧹 Pruned {deleted} expired checkpoint(s)")
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+# 🏭 Process-wide ledger built from the environment (None when disabled)
+def get_checkpoint_ledger():
+    global _ledger
+
+    if not CHECKPOINT_LEDGER:
+        return None
+
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = CheckpointLedger(CHECKPOINT_DB_PATH, CHECKPOINT_TTL_SECONDS)
+        return _ledger
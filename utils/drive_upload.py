@@ -0,0 +1,148 @@
+# 📦 Standard Libraries
+import io
+import os
+
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
+
+# 🔌 Shared Google API client registry
+from utils.google_clients import get_service
+
+# 🔐 Load environment variables
+load_dotenv()
+
+# 📄 Mime type of the generated Word documents
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# 📏 Files up to this size go up as one multipart request; bigger ones use a resumable
+# session (an extra round trip that only pays off for large uploads)
+DRIVE_SIMPLE_UPLOAD_MAX_BYTES = int(os.getenv("DRIVE_SIMPLE_UPLOAD_MAX_MB", "5")) * 1024 * 1024
+DRIVE_RESUMABLE_CHUNK_BYTES = 8 * 1024 * 1024
+
+DEFAULT_SCOPES = ["https://www.googleapis.com/auth/drive"]
+
+
+# 📖 Read-only, seekable file object over a memoryview (no copy of the underlying buffer)
+class _BufferReader(io.RawIOBase):
+    def __init__(self, view):
+        self._view = view
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, target):
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+# 🔄 Turn bytes / bytearray / memoryview / BytesIO into (stream, size) without copying
+def _as_stream(buffer):
+    if isinstance(buffer, io.BytesIO):
+        with buffer.getbuffer() as view:
+            size = view.nbytes
+        buffer.seek(0)
+        return buffer, size
+
+    view = memoryview(buffer).cast("B")
+    return io.BufferedReader(_BufferReader(view)), view.nbytes
+
+
+# 📤 Upload an in-memory file to a Drive folder; safe to call from many threads at once
+# (each thread uses its own Drive client). Returns the created file's metadata.
+def upload_buffer(
+    buffer,
+    name,
+    folder_id,
+    mimetype=DOCX_MIME_TYPE,
+    convert_to=None,
+    scopes=DEFAULT_SCOPES,
+    fields="id, name",
+    app_properties=None,
+):
+    from googleapiclient.http import MediaIoBaseUpload  # Loaded on first upload
+
+    stream, size = _as_stream(buffer)
+    resumable = size > DRIVE_SIMPLE_UPLOAD_MAX_BYTES
+
+    media = MediaIoBaseUpload(
+        stream,
+        mimetype=mimetype,
+        resumable=resumable,
+        chunksize=DRIVE_RESUMABLE_CHUNK_BYTES if resumable else -1,
+    )
+
+    file_metadata = {"name": name, "parents": [folder_id]}
+    if convert_to:
+        file_metadata["mimeType"] = convert_to  # e.g. import the DOCX as a Google Doc
+    if app_properties:
+        file_metadata["appProperties"] = app_properties  # Lets a rerun find this upload
+
+    return (
+        get_service("drive", "v3", scopes)
+        .files()
+        .create(
+            body=file_metadata,
+            media_body=media,
+            fields=fields,
+            supportsAllDrives=True,
+        )
+        .execute()
+    )
+
+
+# ♻️ ID of a file this pipeline already uploaded for the same purpose, so a rerun reuses
+# it instead of creating a duplicate: the ID the checkpoint ledger remembers if that file
+# still exists, else a file in the folder tagged with the same appProperties (an upload
+# that finished but was never recorded). None if there is nothing to reuse
+def find_reusable_upload(folder_id, app_properties, known_id=None, scopes=DEFAULT_SCOPES):
+    from googleapiclient.errors import HttpError
+
+    # Best effort: if Drive can't be asked, the caller simply uploads again
+    try:
+        files = get_service("drive", "v3", scopes).files()
+
+        if known_id:
+            try:
+                found = files.get(
+                    fileId=known_id, fields="id, trashed", supportsAllDrives=True
+                ).execute()
+                if not found.get("trashed"):
+                    return found["id"]
+            except HttpError as e:
+                if e.resp.status != 404:
+                    raise
+
+        if not app_properties:
+            return None
+
+        tags = " and ".join(
+            f"appProperties has {{ key='{key}' and value='{value}' }}"
+            for key, value in app_properties.items()
+        )
+        response = files.list(
+            q=f"'{folder_id}' in parents and trashed=false and {tags}",
+            fields="files(id)",
+            pageSize=1,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True,
+        ).execute()
+        matches = response.get("files", [])
+        return matches[0]["id"] if matches else None
+
+    except Exception as e:
+        print(f"⚠️ Could not look up earlier uploads: {e}")
+        return None
@@ -0,0 +1,104 @@
+# 📦 Standard Libraries
+import threading
+
+# 🔒 Credentials are shared process-wide; google-auth refreshes tokens lazily on use
+_credentials = {}
+_credentials_lock = threading.Lock()
+
+# 📚 Discovery documents, read once per process from the copy bundled with
+# google-api-python-client (no discovery HTTP call at start-up)
+_discovery_docs = {}
+_discovery_lock = threading.Lock()
+
+# 🧵 httplib2 (used by googleapiclient) is not thread-safe, so every thread gets its
+# own service objects and HTTP transport, built once and reused for the whole run
+_local = threading.local()
+
+
+# 🔐 Application default credentials for a scope set (Cloud Run attached service account)
+def get_credentials(scopes):
+    from google.auth import default
+
+    key = tuple(sorted(scopes))
+
+    with _credentials_lock:
+        if key not in _credentials:
+            creds, _ = default(scopes=list(key))
+            _credentials[key] = creds
+        return _credentials[key]
+
+
+# 📚 Static discovery document for an API (None if this client library has no copy)
+def get_discovery_document(api, version):
+    key = (api, version)
+
+    with _discovery_lock:
+        if key not in _discovery_docs:
+            try:
+                from googleapiclient.discovery_cache import get_static_doc
+
+                _discovery_docs[key] = get_static_doc(api, version)
+            except ImportError:
+                _discovery_docs[key] = None
+        return _discovery_docs[key]
+
+
+# 🗃️ Per-thread cache dict
+def _thread_cache():
+    if not hasattr(_local, "clients"):
+        _local.clients = {}
+    return _local.clients
+
+
+# 📡 Google API discovery client (e.g. Drive v3), one per thread and scope set
+def get_service(api, version, scopes):
+    cache = _thread_cache()
+    key = ("service", api, version, tuple(sorted(scopes)))
+
+    if key not in cache:
+        from googleapiclient.discovery import build, build_from_document
+
+        credentials = get_credentials(scopes)
+        document = get_discovery_document(api, version)
+
+        if document:
+            cache[key] = build_from_document(document, credentials=credentials)
+        else:
+            cache[key] = build(
+                api, version, credentials=credentials, cache_discovery=False
+            )
+    return cache[key]
+
+
+# 📊 Authorized gspread client, one per thread and scope set
+def get_gspread_client(scopes):
+    cache = _thread_cache()
+    key = ("gspread", tuple(sorted(scopes)))
+
+    if key not in cache:
+        import gspread
+
+        cache[key] = gspread.authorize(get_credentials(scopes))
+    return cache[key]
+
+
+# 📄 First worksheet of a spreadsheet, opened once per thread
+def get_worksheet(sheet_id, scopes):
+    cache = _thread_cache()
+    key = ("worksheet", sheet_id, tuple(sorted(scopes)))
+
+    if key not in cache:
+        cache[key] = get_gspread_client(scopes).open_by_key(sheet_id).sheet1
+    return cache[key]
+
+
+# 🌊 Authorized requests session (for streamed/ranged media downloads), one per thread
+def get_authorized_session(scopes):
+    cache = _thread_cache()
+    key = ("session", tuple(sorted(scopes)))
+
+    if key not in cache:
+        from google.auth.transport.requests import AuthorizedSession
+
+        cache[key] = AuthorizedSession(get_credentials(scopes))
+    return cache[key]
@@ -0,0 +1,180 @@
+# 📦 Standard Libraries
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
+
+# 🔐 Load environment variables
+load_dotenv()
+
+# ⚙️ Config: backend ("disk", "memory" or "off"), location, expiry and size
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "disk").lower()
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".cache/llm")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))
+
+
+# #️⃣ Hex SHA-256 of a string
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# 🧠 In-process store: LRU order kept by an OrderedDict
+class MemoryResponseStore:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Returns (stored_at, value) or None
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, stored_at, value):
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# 🕒 Last-use time of a cache file; one deleted meanwhile sorts first (already gone)
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+# 💾 On-disk store (one JSON file per entry) so retried rows hit across job runs;
+# file mtime tracks last use for LRU eviction
+class DiskResponseStore:
+    def __init__(self, directory, max_entries):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    # A file evicted (or replaced) by another thread between the read and the
+    # touch is a miss, never an error
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        return entry["stored_at"], entry["value"]
+
+    def set(self, key, stored_at, value):
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"stored_at": stored_at, "value": value}, f)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    # 🧹 Keep only the most recently used max_entries files
+    def _evict(self):
+        with self._lock:
+            paths = [
+                os.path.join(self.directory, name)
+                for name in os.listdir(self.directory)
+                if name.endswith(".json")
+            ]
+            if len(paths) <= self.max_entries:
+                return
+
+            paths.sort(key=_mtime)
+            for path in paths[: len(paths) - self.max_entries]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+# 🗂️ Cache of parsed LLM responses keyed on (model, temperature, system prompt, input)
+class ResponseCache:
+    def __init__(self, store, ttl_seconds):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(model, temperature, system_prompt, input_text):
+        parts = [model, str(temperature), _sha256(system_prompt), _sha256(input_text)]
+        return _sha256("|".join(parts))
+
+    def get(self, model, temperature, system_prompt, input_text):
+        key = self.key_for(model, temperature, system_prompt, input_text)
+        entry = self.store.get(key)
+
+        # Expired entries count as misses and are dropped
+        if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+            self.store.delete(key)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return entry[1]
+
+    # 💾 Only call with successfully parsed JSON (never with a fallback result)
+    def set(self, model, temperature, system_prompt, input_text, value):
+        key = self.key_for(model, temperature, system_prompt, input_text)
+        self.store.set(key, time.time(), value)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# 🏭 Process-wide response cache built from the environment (None when caching is off)
+def get_response_cache():
+    global _cache
+
+    if LLM_CACHE_BACKEND == "off":
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            if LLM_CACHE_BACKEND == "memory":
+                store = MemoryResponseStore(LLM_CACHE_MAX_ENTRIES)
+            else:
+                store = DiskResponseStore(LLM_CACHE_DIR, LLM_CACHE_MAX_ENTRIES)
+            _cache = ResponseCache(store, LLM_CACHE_TTL_SECONDS)
+
+        return _cache
@@ -0,0 +1,359 @@
+# 📦 Standard Libraries
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
+
+# 🔢 Prompt size estimates for the chat token bucket
+from utils.tokens import estimate_tokens
+
+# 🔐 Load environment variables
+load_dotenv()
+
+# 🔑 The one place the OpenAI key is read; it is passed per request, never set globally
+OPENAI_KEY = os.getenv("OPENAI_KEY")
+
+# 🪣 Account limits the buckets pace requests to: Whisper requests per minute and chat
+# tokens per minute (prompt + expected completion, corrected from `usage` afterwards)
+OPENAI_WHISPER_RPM = float(os.getenv("OPENAI_WHISPER_RPM", "50"))
+OPENAI_CHAT_TPM = float(os.getenv("OPENAI_CHAT_TPM", "30000"))
+OPENAI_CHAT_COMPLETION_TOKENS = int(os.getenv("OPENAI_CHAT_COMPLETION_TOKENS", "1500"))
+
+# 🔁 Retries for rate limits and transient API errors (exponential backoff, full jitter)
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+OPENAI_BACKOFF_BASE_SECONDS = float(os.getenv("OPENAI_BACKOFF_BASE_SECONDS", "1"))
+OPENAI_BACKOFF_MAX_SECONDS = float(os.getenv("OPENAI_BACKOFF_MAX_SECONDS", "60"))
+
+# ⏱️ Per-attempt deadlines grow with the input: a base plus seconds per 1k chat tokens
+# (prompt + expected completion) or per minute of audio, capped at a maximum. Whisper
+# time tracks audio length, not file size: a 32 kbps upload packs ~2h into 25MB
+OPENAI_DEADLINE_BASE_SECONDS = float(os.getenv("OPENAI_DEADLINE_BASE_SECONDS", "20"))
+OPENAI_CHAT_SECONDS_PER_1K_TOKENS = float(os.getenv("OPENAI_CHAT_SECONDS_PER_1K_TOKENS", "6"))
+OPENAI_WHISPER_SECONDS_PER_AUDIO_MINUTE = float(os.getenv("OPENAI_WHISPER_SECONDS_PER_AUDIO_MINUTE", "6"))
+OPENAI_CHAT_TIMEOUT = float(os.getenv("OPENAI_CHAT_TIMEOUT", "180"))
+OPENAI_WHISPER_TIMEOUT = float(os.getenv("OPENAI_WHISPER_TIMEOUT", "900"))
+
+# 🏇 Hedging of idempotent calls: once an attempt is slower than the observed latency
+# percentile, a duplicate request races it. Capped at a share of all calls, and only
+# active once enough latencies have been observed
+OPENAI_HEDGE_PERCENTILE = float(os.getenv("OPENAI_HEDGE_PERCENTILE", "95"))
+OPENAI_HEDGE_MAX_RATE = float(os.getenv("OPENAI_HEDGE_MAX_RATE", "0.05"))
+OPENAI_HEDGE_MIN_SAMPLES = int(os.getenv("OPENAI_HEDGE_MIN_SAMPLES", "20"))
+
+# 🧾 Per-message framing tokens the chat format adds on top of the content
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+# 🪣 Token bucket refilled continuously at capacity-per-minute; acquire() blocks until
+# enough budget is available and returns how long it waited
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.available = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount):
+        # A request larger than the whole bucket only waits for a full bucket
+        amount = min(amount, self.capacity)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self.available >= amount:
+                    self.available -= amount
+                    return waited
+                wait = (amount - self.available) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+    # ⚖️ Correct an estimate once the real cost is known (may leave the bucket in debt)
+    def adjust(self, delta):
+        with self._lock:
+            self._refill()
+            self.available = min(self.capacity, self.available - delta)
+
+
+# 📊 Per-endpoint counters used to tune concurrency against the account limits
+class GatewayStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.throttled_seconds = 0.0  # Waiting on the local token bucket
+        self.backoff_seconds = 0.0  # Sleeping between retries (incl. Retry-After)
+        self.calls = 0  # Attempts that could have been hedged
+        self.deadlines_missed = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "throttled_seconds": round(self.throttled_seconds, 1),
+                "backoff_seconds": round(self.backoff_seconds, 1),
+                "deadlines_missed": self.deadlines_missed,
+                "hedges_fired": self.hedges_fired,
+                "hedges_won": self.hedges_won,
+            }
+
+    # 🧢 True (and counted) if one more hedge stays within the allowed hedge rate
+    def take_hedge(self):
+        with self._lock:
+            if self.hedges_fired + 1 > OPENAI_HEDGE_MAX_RATE * self.calls:
+                return False
+            self.hedges_fired += 1
+            return True
+
+
+# 📈 Recent attempt latencies as a fraction of their deadline, so calls of any input
+# size share one distribution
+class LatencyTracker:
+    def __init__(self, size=200):
+        self._ratios = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, deadline):
+        with self._lock:
+            self._ratios.append(min(1.0, seconds / deadline))
+
+    # ⏱️ Seconds after which an attempt with this deadline is slower than the percentile
+    # (None until enough samples exist)
+    def hedge_after(self, deadline):
+        with self._lock:
+            if len(self._ratios) < OPENAI_HEDGE_MIN_SAMPLES:
+                return None
+            ratios = sorted(self._ratios)
+        index = min(len(ratios) - 1, int(len(ratios) * OPENAI_HEDGE_PERCENTILE / 100))
+        return ratios[index] * deadline
+
+
+# 🧵 Runs fn on a daemon thread and returns its Future; a request abandoned at its
+# deadline keeps its thread until the HTTP call ends but never blocks process exit
+def _spawn(fn):
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="openai-request", daemon=True).start()
+    return future
+
+
+# ⏳ Seconds the server asked us to wait (Retry-After header), if any
+def _retry_after(error):
+    headers = getattr(error, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+# 🚦 Single entry point for every OpenAI call: paces requests through the buckets,
+# retries rate limits and transient failures, and keeps throttling counters
+class OpenAIGateway:
+    def __init__(self):
+        self.whisper_bucket = TokenBucket(OPENAI_WHISPER_RPM)
+        self.chat_bucket = TokenBucket(OPENAI_CHAT_TPM)
+        self.stats = {"whisper": GatewayStats(), "chat": GatewayStats()}
+        self.latency = {"whisper": LatencyTracker(), "chat": LatencyTracker()}
+
+    # 🏇 One attempt bounded by `deadline` seconds (bucket waits excluded). Idempotent
+    # attempts slower than the observed percentile get a hedged duplicate, which pays
+    # for its own bucket budget; the first good response wins
+    def _attempt(self, kind, acquire, send, deadline, idempotent):
+        import openai
+
+        stats = self.stats[kind]
+        stats.add(calls=1)
+        acquire()
+        started = time.monotonic()
+        end = started + deadline
+
+        primary = _spawn(send)
+        pending = [primary]
+        hedge = None
+        hedge_started = None
+        hedge_at = self.latency[kind].hedge_after(deadline) if idempotent else None
+        error = None
+
+        while pending:
+            now = time.monotonic()
+            timeout = end - now
+            if hedge_at is not None:
+                timeout = min(timeout, started + hedge_at - now)
+
+            done, _ = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                if future.exception() is None:
+                    elapsed = time.monotonic() - (started if future is primary else hedge_started)
+                    self.latency[kind].record(elapsed, deadline)
+                    if future is hedge:
+                        stats.add(hedges_won=1)
+                    return future.result()
+                error = future.exception()
+
+            now = time.monotonic()
+            if now >= end:
+                break
+
+            if hedge_at is not None and now >= started + hedge_at and pending:
+                hedge_at = None
+                if stats.take_hedge():
+                    print(f"🏇 OpenAI {kind} call slower than p{OPENAI_HEDGE_PERCENTILE:g}; sending a hedged request")
+                    hedge_started = time.monotonic()
+                    hedge = _spawn(lambda: (acquire(), send())[1])
+                    pending.append(hedge)
+
+        if pending:
+            # Abandoned attempts still count as deadline-long for the latency percentile
+            self.latency[kind].record(deadline, deadline)
+            stats.add(deadlines_missed=1)
+            raise openai.error.Timeout(f"OpenAI {kind} call exceeded its {deadline:.0f}s deadline")
+        raise error
+
+    # 🔁 Runs call() with retries; only rate limits and transient errors are retried
+    def _with_retries(self, kind, call):
+        import openai
+
+        retryable = (
+            openai.error.RateLimitError,
+            openai.error.APIError,
+            openai.error.Timeout,
+            openai.error.APIConnectionError,
+            openai.error.ServiceUnavailableError,
+        )
+        stats = self.stats[kind]
+
+        for attempt in range(OPENAI_MAX_RETRIES + 1):
+            try:
+                return call()
+
+            except retryable as e:
+                rate_limited = isinstance(e, openai.error.RateLimitError)
+                # An exhausted quota is not a rate limit; waiting will not fix it
+                if attempt == OPENAI_MAX_RETRIES or getattr(e, "code", None) == "insufficient_quota":
+                    raise
+
+                backoff = min(OPENAI_BACKOFF_MAX_SECONDS, OPENAI_BACKOFF_BASE_SECONDS * 2**attempt)
+                wait = random.uniform(0, backoff)
+                retry_after = _retry_after(e)
+                if retry_after is not None:
+                    wait = max(wait, retry_after)
+
+                stats.add(retries=1, rate_limited=int(rate_limited), backoff_seconds=wait)
+                print(f"⏳ OpenAI {kind} call failed ({type(e).__name__}); retrying in {wait:.1f}s")
+                time.sleep(wait)
+
+    # 💬 ChatCompletion.create, paced by estimated tokens; summaries are idempotent and
+    # may be hedged
+    def chat_completion(self, messages, idempotent=False, **kwargs):
+        import openai
+
+        estimate = OPENAI_CHAT_COMPLETION_TOKENS + sum(
+            estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS for message in messages
+        )
+        deadline = min(
+            OPENAI_CHAT_TIMEOUT,
+            OPENAI_DEADLINE_BASE_SECONDS + estimate / 1000 * OPENAI_CHAT_SECONDS_PER_1K_TOKENS,
+        )
+        # The HTTP request itself is abandoned at the deadline too
+        kwargs.setdefault("request_timeout", deadline)
+
+        def acquire():
+            waited = self.chat_bucket.acquire(estimate)
+            self.stats["chat"].add(requests=1, throttled_seconds=waited)
+
+        def send():
+            return openai.ChatCompletion.create(messages=messages, api_key=OPENAI_KEY, **kwargs)
+
+        response = self._with_retries(
+            "chat", lambda: self._attempt("chat", acquire, send, deadline, idempotent)
+        )
+
+        usage = response.get("usage") if hasattr(response, "get") else None
+        if usage and usage.get("total_tokens"):
+            self.chat_bucket.adjust(usage["total_tokens"] - estimate)
+        return response
+
+    # 🎧 Audio.transcribe for a file on disk, paced by requests per minute, with a
+    # deadline from the audio duration; the file is reopened on every attempt so a
+    # retry or hedge never shares a half-read stream
+    def transcribe(self, audio_path, idempotent=False, duration_seconds=None, **kwargs):
+        import openai
+
+        # Unknown length (no duration in the container): allow the full cap
+        deadline = OPENAI_WHISPER_TIMEOUT
+        if duration_seconds:
+            deadline = min(
+                OPENAI_WHISPER_TIMEOUT,
+                OPENAI_DEADLINE_BASE_SECONDS
+                + duration_seconds / 60 * OPENAI_WHISPER_SECONDS_PER_AUDIO_MINUTE,
+            )
+
+        def acquire():
+            waited = self.whisper_bucket.acquire(1)
+            self.stats["whisper"].add(requests=1, throttled_seconds=waited)
+
+        def send():
+            with open(audio_path, "rb") as audio_file:
+                return openai.Audio.transcribe(file=audio_file, api_key=OPENAI_KEY, **kwargs)
+
+        return self._with_retries(
+            "whisper", lambda: self._attempt("whisper", acquire, send, deadline, idempotent)
+        )
+
+    # 🖨️ One line per endpoint that was used
+    def print_stats(self):
+        for kind, stats in self.stats.items():
+            s = stats.snapshot()
+            if s["requests"]:
+                print(
+                    f"🚦 OpenAI {kind}: {s['requests']} request(s), {s['retries']} retries, "
+                    f"{s['rate_limited']} rate-limited, throttled {s['throttled_seconds']}s, "
+                    f"backoff {s['backoff_seconds']}s, {s['deadlines_missed']} deadline(s) missed, "
+                    f"hedges {s['hedges_won']}/{s['hedges_fired']} won"
+                )
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+# 🏭 Process-wide gateway, so every module shares the same buckets
+def get_openai_gateway():
+    global _gateway
+
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = OpenAIGateway()
+        return _gateway
@@ -0,0 +1,169 @@
+# 📦 Standard Libraries
+import queue
+import threading
+import time
+
+
+# 🛑 Sentinel pushed through a queue to tell a stage's workers to shut down
+_STOP = object()
+
+
+# 🧱 A single pipeline stage: a function applied to each item by N worker threads
+class Stage:
+    def __init__(self, name, func, workers=1, queue_size=4):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.inbox = queue.Queue(maxsize=max(1, int(queue_size)))
+
+        # 📈 Counters used for the end-of-run sizing report
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    # ➕ Put an item on this stage's queue (blocks while the queue is full)
+    def put(self, item):
+        self.inbox.put(item)
+        if item is not _STOP:
+            self._sample_depth()
+
+    # 📏 Record the current queue depth
+    def _sample_depth(self):
+        depth = self.inbox.qsize()
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_total += depth
+            self._depth_samples += 1
+
+    # 🧮 Add one finished item to the stage counters
+    def _record(self, elapsed, outcome):
+        with self._lock:
+            self.busy_seconds += elapsed
+            if outcome == "ok":
+                self.processed += 1
+            elif outcome == "dropped":
+                self.dropped += 1
+            else:
+                self.errors += 1
+
+    # 📊 Snapshot of the stage metrics for a run that lasted `wall_seconds`
+    def stats(self, wall_seconds):
+        with self._lock:
+            capacity = self.workers * wall_seconds
+            return {
+                "stage": self.name,
+                "workers": self.workers,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "busy_seconds": round(self.busy_seconds, 2),
+                "utilisation": round(self.busy_seconds / capacity, 3) if capacity else 0.0,
+                "max_queue_depth": self.max_depth,
+                "avg_queue_depth": (
+                    round(self._depth_total / self._depth_samples, 2)
+                    if self._depth_samples
+                    else 0.0
+                ),
+            }
+
+
+# 🏭 Runs items through a chain of stages connected by bounded queues
+class Pipeline:
+    def __init__(self, stages, on_error=None):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage.")
+
+        self.stages = stages
+        self.on_error = on_error
+        self.results = []
+        self.wall_seconds = 0.0
+        self._results_lock = threading.Lock()
+
+    # 👷 Worker loop: take from this stage, hand the result to the next one
+    def _worker(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = stage.inbox.get()
+            if item is _STOP:
+                break
+
+            started = time.perf_counter()
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                stage._record(time.perf_counter() - started, "error")
+                print(f"❌ Stage '{stage.name}' failed: {e}")
+                if self.on_error:
+                    # A failing handler must not kill the worker, or the stage stalls
+                    try:
+                        self.on_error(stage.name, item, e)
+                    except Exception as handler_error:
+                        print(f"❌ Error handler for stage '{stage.name}' failed: {handler_error}")
+                continue
+
+            # A stage returns None to drop the item from the pipeline
+            if result is None:
+                stage._record(time.perf_counter() - started, "dropped")
+                continue
+
+            stage._record(time.perf_counter() - started, "ok")
+            if next_stage:
+                next_stage.put(result)
+            else:
+                with self._results_lock:
+                    self.results.append(result)
+
+    # ▶️ Feed all items through the pipeline and wait for it to drain
+    def run(self, items):
+        started = time.perf_counter()
+        threads_per_stage = []
+
+        for index, stage in enumerate(self.stages):
+            threads = [
+                threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"{stage.name}-{n}",
+                    daemon=True,
+                )
+                for n in range(stage.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            threads_per_stage.append(threads)
+
+        # 📥 Feeding blocks while the first queue is full (back-pressure)
+        for item in items:
+            self.stages[0].put(item)
+
+        # 🧹 Shut stages down in order so every item drains downstream first
+        for stage, threads in zip(self.stages, threads_per_stage):
+            for _ in threads:
+                stage.put(_STOP)
+            for thread in threads:
+                thread.join()
+
+        self.wall_seconds = time.perf_counter() - started
+        return self.results
+
+    # 📊 Per-stage metrics from the last run
+    def stats(self):
+        return [stage.stats(self.wall_seconds) for stage in self.stages]
+
+    # 🖨️ Print a per-stage sizing report (queue depth and utilisation)
+    def print_report(self):
+        print(f"\n🏭 Pipeline report ({round(self.wall_seconds, 1)}s wall time)")
+        for s in self.stats():
+            print(
+                f"   {s['stage']:<12} workers={s['workers']} "
+                f"done={s['processed']} dropped={s['dropped']} errors={s['errors']} "
+                f"busy={s['busy_seconds']}s util={int(s['utilisation'] * 100)}% "
+                f"queue(max={s['max_queue_depth']}, avg={s['avg_queue_depth']})"
+            )
@@ -1,11 +1,17 @@
 # 📦 Standard Libraries
 import os
+import json
+import time
+import hashlib
+import threading
+from typing import NamedTuple
 
 # 🌐 Third-Party Libraries
-import gspread
-from google.auth import default
 from dotenv import load_dotenv
 
+# 🔌 Shared Google API client registry
+from utils.google_clients import get_worksheet
+
 # 🔐 Load environment variables from .env
 load_dotenv()
 
@@ -19,6 +25,160 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive",
 ]
 
+# 📦 Write-back buffer: flush once this many cells are pending, or after this many seconds
+SHEET_WRITE_BATCH_CELLS = int(os.getenv("SHEET_WRITE_BATCH_CELLS", "60"))
+SHEET_WRITE_FLUSH_SECONDS = float(os.getenv("SHEET_WRITE_FLUSH_SECONDS", "15"))
+
+# 🗂️ Incremental scan state (row fingerprints + high-water mark) and retry policy:
+# an unchanged, still-pending row is handed out again only after this many minutes
+SHEET_STATE_PATH = os.getenv("SHEET_STATE_PATH", ".cache/sheet_state.json")
+SHEET_RETRY_UNCHANGED_MINUTES = float(os.getenv("SHEET_RETRY_UNCHANGED_MINUTES", "0"))
+
+# 📏 Max ranges per values.batchGet request when fetching individual pending rows
+SHEET_SCAN_RANGES_PER_REQUEST = 200
+
+
+# 🧾 One sheet row, reduced to the columns the summarizer uses (A, B, E, F, I)
+class SheetRow(NamedTuple):
+    row_index: int
+    meeting_date: str
+    company_name: str
+    website_url: str
+    audio_folder_link: str
+    status: str
+
+    # 🔧 Build from a full A..I row as returned by get_all_values()
+    @classmethod
+    def from_values(cls, row_index, values):
+        cell = lambda i: values[i].strip() if len(values) > i else ""
+        return cls(row_index, cell(0), cell(1), cell(4), cell(5), cell(8).lower())
+
+    @property
+    def is_done(self):
+        return self.status == "done"
+
+    # 🔧 Build from the separately fetched A:B, E:F and I cells of one row
+    @classmethod
+    def from_ranges(cls, row_index, ab, ef, i):
+        pad = lambda cells, n: (list(cells) + [""] * n)[:n]
+        return cls.from_values(row_index, pad(ab, 2) + ["", ""] + pad(ef, 2) + ["", ""] + pad(i, 1))
+
+    @property
+    def is_blank(self):
+        return not any(self[1:])
+
+    # #️⃣ Stable hash of the row's content, used to notice edits between runs
+    def fingerprint(self):
+        content = "\x1f".join(self[1:])
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+# 🔠 Converts a 1-based (row, col) pair to A1 notation, e.g. (5, 7) → "G5"
+def _a1(row, col):
+    letters = ""
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return f"{letters}{row}"
+
+
+# 🧺 Collects cell updates from many rows and writes them in a single batch_update call
+class SheetWriteBuffer:
+    """
+    Buffered sheet writer. Cells are flushed as one values batchUpdate when the buffer
+    reaches `max_cells`, when `flush_seconds` have passed (if set), and on close().
+    """
+
+    def __init__(self, max_cells=SHEET_WRITE_BATCH_CELLS, flush_seconds=SHEET_WRITE_FLUSH_SECONDS):
+        self.max_cells = max_cells
+        self.flush_seconds = flush_seconds
+        self.api_writes = 0
+        self.cells_written = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._timer = None
+
+        if flush_seconds:
+            self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._timer.start()
+
+    # ➕ Queue one cell (a later value for the same cell replaces the earlier one)
+    def add(self, row_index, col_index, value):
+        self.add_row(row_index, {col_index: value})
+
+    # ➕ Queue several cells of one row together, so a size flush never splits a row
+    def add_row(self, row_index, values_by_col):
+        with self._lock:
+            for col_index, value in values_by_col.items():
+                self._pending[(row_index, col_index)] = value
+            full = len(self._pending) >= self.max_cells
+
+        # A failed size flush leaves the cells queued (flush() logged it); close()
+        # decides the outcome, so the row that happened to fill the buffer isn't failed
+        if full:
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    # 📤 Write every pending cell in one API call; failed cells stay queued for the next flush
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                cells, self._pending = self._pending, {}
+
+            if not cells:
+                return
+
+            data = [
+                {"range": _a1(row, col), "values": [[value]]}
+                for (row, col), value in sorted(cells.items())
+            ]
+            try:
+                # USER_ENTERED so HYPERLINK formulas are evaluated, like update_cell
+                get_worksheet(SHEET_ID, SCOPES).batch_update(
+                    data, value_input_option="USER_ENTERED"
+                )
+                self.api_writes += 1
+                self.cells_written += len(cells)
+                print(f"📤 Sheet write-back: {len(cells)} cell(s) in one batch update")
+
+            except Exception as e:
+                print(f"⚠️ Sheet batch update failed, will retry: {e}")
+                with self._lock:
+                    for cell, value in cells.items():
+                        self._pending.setdefault(cell, value)
+                raise
+
+    # ⏲️ Background flush so a slow run doesn't hold updates until shutdown
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    # 🛑 Stop the timer and flush what's left (retrying with backoff, e.g. on 429s)
+    def close(self, attempts=4):
+        self._stopped.set()
+        if self._timer:
+            self._timer.join()
+
+        for attempt in range(attempts):
+            try:
+                self.flush()
+                break
+            except Exception:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(2 ** (attempt + 2))
+
+        print(
+            f"📊 Sheet write-back: {self.cells_written} cell(s) in {self.api_writes} API write(s)"
+        )
+
 
 # 📥 Get all rows that are pending processing
 def get_pending_rows():
@@ -26,51 +186,173 @@ def get_pending_rows():
     Fetch rows from the Google Sheet that have website and audio links but are not marked 'done'.
     Returns a list of tuples (row_index, website_link, audio_link).
     """
-    # 🔐 Authenticate using Cloud Run's attached service account
-    creds, _ = default(scopes=SCOPES)
-    client = gspread.authorize(creds)
-
-    # Open the first worksheet in the specified sheet
-    sheet = client.open_by_key(SHEET_ID).sheet1
+    # Open the first worksheet in the specified sheet (shared, already authorized client)
+    sheet = get_worksheet(SHEET_ID, SCOPES)
     records = sheet.get_all_values()
 
     # 🟡 Filter for rows that have both website and audio links and are not marked "done"
     pending = []
-    for idx, row in enumerate(records[1:], start=2):  # Skip header (row 0)
-        website = row[4].strip() if len(row) >= 5 else ""
-        audio = row[5].strip() if len(row) >= 6 else ""
-        status = row[8].strip().lower() if len(row) >= 9 else ""
+    for idx, values in enumerate(records[1:], start=2):  # Skip header (row 0)
+        row = SheetRow.from_values(idx, values)
 
         # ✅ Add row index and relevant data if ready to process
-        if website and audio and status != "done":
-            pending.append((idx, website, audio))
+        if row.website_url and row.audio_folder_link and not row.is_done:
+            pending.append((idx, row.website_url, row.audio_folder_link))
 
     return pending
 
 
+# 💾 Read the scan state for this sheet from the local state file
+def _load_scan_state(state_path, sheet_id):
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        state = {}
+
+    return state, state.setdefault(sheet_id, {"high_water_mark": 1, "rows": {}})
+
+
+# 💾 Atomically write the scan state back to disk
+def _save_scan_state(state_path, state):
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(temp_path, state_path)
+
+
+# 🔍 Incremental scan: reads only columns A, B, E, F and I, and only the rows that can
+# still need work. Returns (pending_rows, rows_seen).
+def scan_pending_rows(sheet=None, state_path=SHEET_STATE_PATH, sheet_id=SHEET_ID):
+    """
+    Return SheetRow records for new or changed rows that are not marked 'done'.
+
+    Rows up to the stored high-water mark are checked through their status column only;
+    full values are fetched just for the ones that are not Done. Rows past the mark are
+    read as one block. A pending row whose fingerprint is unchanged since it was last
+    handed out is skipped until SHEET_RETRY_UNCHANGED_MINUTES have passed.
+    """
+    sheet = sheet or get_worksheet(sheet_id, SCOPES)
+    state, sheet_state = _load_scan_state(state_path, sheet_id)
+    high_water_mark = sheet_state["high_water_mark"]
+    known_rows = sheet_state["rows"]
+
+    # 1️⃣ One request: status column of known rows + all columns of rows past the mark
+    ranges = [f"A{high_water_mark + 1}:B", f"E{high_water_mark + 1}:F", f"I{high_water_mark + 1}:I"]
+    if high_water_mark >= 2:
+        ranges.insert(0, f"I2:I{high_water_mark}")
+    fetched = sheet.batch_get(ranges)
+    known_statuses = fetched.pop(0) if high_water_mark >= 2 else []
+    new_ab, new_ef, new_i = fetched
+
+    cell_row = lambda cells, n: cells[n] if n < len(cells) else []
+    rows = []
+    new_count = max(len(new_ab), len(new_ef), len(new_i))
+    for offset in range(new_count):
+        rows.append(
+            SheetRow.from_ranges(
+                high_water_mark + 1 + offset,
+                cell_row(new_ab, offset),
+                cell_row(new_ef, offset),
+                cell_row(new_i, offset),
+            )
+        )
+
+    # 2️⃣ Known rows that are not Done: fetch their A:B, E:F and I cells in batches
+    open_rows = []
+    for offset in range(high_water_mark - 1):
+        status = cell_row(known_statuses, offset)
+        if status and status[0].strip().lower() == "done":
+            known_rows.pop(str(offset + 2), None)  # Done rows never need a fingerprint
+        else:
+            open_rows.append(offset + 2)
+    rows_per_request = SHEET_SCAN_RANGES_PER_REQUEST // 3
+    for start in range(0, len(open_rows), rows_per_request):
+        batch = open_rows[start : start + rows_per_request]
+        ranges = []
+        for idx in batch:
+            ranges += [f"A{idx}:B{idx}", f"E{idx}:F{idx}", f"I{idx}"]
+
+        values = sheet.batch_get(ranges)
+        for n, idx in enumerate(batch):
+            ab, ef, i = (cell_row(values[3 * n + k], 0) for k in range(3))
+            rows.append(SheetRow.from_ranges(idx, ab, ef, i))
+
+    # 3️⃣ Keep new or changed pending rows (and unchanged ones due for a retry)
+    now = time.time()
+    pending = []
+    last_row = 1
+    for row in sorted(rows):
+        key = str(row.row_index)
+
+        # Done and empty rows never need a fingerprint
+        if row.is_done or row.is_blank:
+            known_rows.pop(key, None)
+            if not row.is_blank:
+                last_row = row.row_index
+            continue
+
+        last_row = row.row_index
+
+        previous = known_rows.get(key)
+        fingerprint = row.fingerprint()
+        if (
+            previous
+            and previous["fingerprint"] == fingerprint
+            and now - previous["handed_out_at"] < SHEET_RETRY_UNCHANGED_MINUTES * 60
+        ):
+            continue
+
+        known_rows[key] = {"fingerprint": fingerprint, "handed_out_at": now}
+        pending.append(row)
+
+    # Done rows below the mark were skipped via the status column; the mark only moves
+    # back when rows were deleted from the bottom of the sheet
+    if len(known_statuses) > last_row - 1:
+        last_row = len(known_statuses) + 1
+
+    # Forget rows that no longer exist
+    for key in [key for key in known_rows if int(key) > last_row]:
+        del known_rows[key]
+
+    sheet_state["high_water_mark"] = last_row
+    _save_scan_state(state_path, state)
+
+    rows_seen = last_row - 1
+    print(
+        f"🔎 Sheet scan: {rows_seen} row(s), {new_count} new, "
+        f"{len(open_rows)} open, {len(pending)} to process"
+    )
+    return pending, rows_seen
+
+
 # 📤 Update a row in the Google Sheet with summary links and status
 def update_sheet_with_links(
-    row_index, meeting_url=None, meeting_name=None, website_url=None, website_name=None
+    row_index,
+    meeting_url=None,
+    meeting_name=None,
+    website_url=None,
+    website_name=None,
+    buffer=None,
 ):
     """
     Update a row in the Google Sheet with meeting and/or website links, and mark it as done.
+    With a SheetWriteBuffer the cells are queued for the next batch write; without one
+    they are written right away in a single batch update.
     """
-    # 🔐 Authenticate using Cloud Run's attached service account
-    creds, _ = default(scopes=SCOPES)
-    client = gspread.authorize(creds)
-
-    sheet = client.open_by_key(SHEET_ID).sheet1
-    wrote_something = False
+    writer = buffer or SheetWriteBuffer(flush_seconds=None)
+    cells = {}
 
     if meeting_url and meeting_name:
-        formula = f'=HYPERLINK("{meeting_url}", "{meeting_name}")'
-        sheet.update_cell(row_index, 7, formula)
-        wrote_something = True
+        cells[7] = f'=HYPERLINK("{meeting_url}", "{meeting_name}")'
 
     if website_url and website_name:
-        formula = f'=HYPERLINK("{website_url}", "{website_name}")'
-        sheet.update_cell(row_index, 8, formula)
-        wrote_something = True
+        cells[8] = f'=HYPERLINK("{website_url}", "{website_name}")'
+
+    if cells:
+        cells[9] = "Done"
+        writer.add_row(row_index, cells)
 
-    if wrote_something:
-        sheet.update_cell(row_index, 9, "Done")
+    if buffer is None:
+        writer.flush()
@@ -0,0 +1,80 @@
+# 📦 Standard Libraries
+import os
+import subprocess
+import sys
+import time
+
+# 📁 Project root, so `import main` resolves in the child interpreter
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 🐢 Heavy third-party libraries are imported inside the functions that need them, not
+# at module level, to keep job start-up fast. These are the modules each pipeline
+# stage loads on first use, in the order a run needs them
+STAGE_MODULES = [
+    ("sheet scan", "gspread"),
+    ("sheet scan", "google.auth"),
+    ("drive", "googleapiclient.discovery"),
+    ("drive", "googleapiclient.http"),
+    ("transcribe/summarize", "openai"),
+    ("website extract", "requests"),
+    ("website extract", "bs4"),
+    ("docx render", "docx"),
+]
+
+
+# ⏱️ Runs `python -X importtime` in a fresh interpreter and returns the cumulative
+# import time (seconds) of each requested module, or None if it failed to import
+def measure_import_times(modules):
+    times = {}
+    for module in modules:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+        )
+        if result.returncode != 0:
+            times[module] = None
+            continue
+
+        # Last line is the requested module itself: "import time: self | cumulative | name"
+        for line in reversed(result.stderr.splitlines()):
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                times[module] = int(parts[1]) / 1_000_000
+                break
+        else:
+            times[module] = None
+    return times
+
+
+# 🖨️ Prints an import-time breakdown for the entry point and every lazily loaded stage
+def print_startup_profile():
+    print("⏱️ Startup profile (fresh interpreter per module, cumulative import time)")
+
+    started = time.perf_counter()
+    entry = measure_import_times(["main"])["main"]
+    print(f"   {'main.py (eager imports)':<32} {_format_seconds(entry)}")
+
+    times = measure_import_times([module for _, module in STAGE_MODULES])
+    for stage, module in STAGE_MODULES:
+        print(f"   {f'{stage}: {module}':<32} {_format_seconds(times[module])}")
+
+    # 📚 Cost of reading the bundled Drive discovery document (no network involved)
+    from utils.google_clients import get_discovery_document
+
+    doc_started = time.perf_counter()
+    document = get_discovery_document("drive", "v3")
+    doc_label = "drive v3 discovery document"
+    if document is None:
+        print(f"   {doc_label:<32} not bundled (falls back to build())")
+    else:
+        print(f"   {doc_label:<32} {_format_seconds(time.perf_counter() - doc_started)}")
+
+    print(f"   {'profiling wall time':<32} {_format_seconds(time.perf_counter() - started)}")
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return "not installed"
+    return f"{seconds * 1000:.1f} ms"
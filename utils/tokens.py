@@ -0,0 +1,9 @@
+# 🔢 Token estimates for budgeting prompts. GPT-4-class tokenizers average about four
+# characters of English text per token, which is close enough to size prompts and
+# pick code paths without shipping a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+# 🧮 Estimated number of tokens in a string
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
@@ -0,0 +1,168 @@
+# 📦 Standard Libraries
+import os
+from urllib.parse import urlsplit, urlunsplit
+
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
+
+# 🔗 Pooled fetching and HTML-to-text extraction
+from website.fetch import get_page, prefetch
+from website.extract import extract_page
+from utils.tokens import CHARS_PER_TOKEN
+
+# 🔐 Load environment variables
+load_dotenv()
+
+# ⚙️ Crawl limits: pages per site (1 = landing page only) and the text budget handed
+# to the summarizer, in tokens (estimated at ~4 characters per token)
+WEBSITE_CRAWL_MAX_PAGES = int(os.getenv("WEBSITE_CRAWL_MAX_PAGES", "5"))
+WEBSITE_CRAWL_TOKEN_BUDGET = int(os.getenv("WEBSITE_CRAWL_TOKEN_BUDGET", "12000"))
+
+# 🎯 Link keywords, highest priority first: the pages that feed the "About the Company",
+# "Company Information", "Products/Service Categories", "Reviews/Testimonials" and
+# "Offers" sections of the website summary
+PRIORITY_KEYWORDS = [
+    ("about", "company", "who-we-are", "our-story"),
+    ("service", "solution", "product", "what-we-do"),
+    ("testimonial", "review", "client", "case-stud"),
+    ("offer", "pricing", "price", "package", "plan", "deal"),
+    ("contact", "team", "location"),
+]
+
+# 🚫 Links that never lead to readable HTML
+SKIPPED_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip",
+    ".mp3", ".mp4", ".mov", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+)
+
+# ✂️ Lines this short that repeat across pages are menu/footer items and are dropped
+BOILERPLATE_MAX_WORDS = 3
+
+
+# 🏠 Host without a leading "www." so example.com and www.example.com match
+def _site(url):
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+# 🧭 Canonical form of a link: no fragment, no trailing slash (None if not crawlable)
+def _normalize(url):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    if parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+        return None
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme, parts.netloc.lower(), path, parts.query, ""))
+
+
+# 🏅 Lower is better: index of the first keyword group the link path or text matches
+def _priority(url, label):
+    haystack = f"{urlsplit(url).path} {label}".lower()
+    for rank, keywords in enumerate(PRIORITY_KEYWORDS):
+        if any(keyword in haystack for keyword in keywords):
+            return rank
+    return len(PRIORITY_KEYWORDS)
+
+
+# 📋 Same-site links of the landing page, best first (keyword-matched before the rest)
+def select_links(start_url, links, limit):
+    site = _site(start_url)
+    start = _normalize(start_url)
+    ranked = {}
+
+    for position, (href, label) in enumerate(links):
+        url = _normalize(href)
+        if not url or url == start or _site(url) != site:
+            continue
+        rank = (_priority(url, label), url.count("/"), position)
+        if url not in ranked or rank < ranked[url]:
+            ranked[url] = rank
+
+    return sorted(ranked, key=ranked.get)[:limit]
+
+
+# 🧹 Drops navigation/footer lines repeated across pages: short ones everywhere,
+# longer ones (addresses, contact blurbs) after their first appearance
+def strip_boilerplate(pages):
+    if len(pages) < 2:
+        return pages
+
+    page_count = {}
+    for _, text in pages:
+        for line in set(text.splitlines()):
+            page_count[line] = page_count.get(line, 0) + 1
+
+    seen = set()
+    cleaned = []
+    for url, text in pages:
+        kept = []
+        for line in text.splitlines():
+            if page_count[line] > 1:
+                if len(line.split()) <= BOILERPLATE_MAX_WORDS or line in seen:
+                    continue
+                seen.add(line)
+            kept.append(line)
+        cleaned.append((url, "\n".join(kept)))
+    return cleaned
+
+
+# 🧮 Combines page texts within the character budget, in priority order. Budget is
+# water-filled: short pages keep all their text and what they leave over is shared
+# evenly by the longer ones, so one huge page cannot crowd out the others
+def combine_pages(pages, max_chars):
+    pages = [(url, text) for url, text in pages if text]
+    if len(pages) == 1:
+        return pages[0][1][:max_chars]
+
+    headers = [f"### Page: {urlsplit(url).path or '/'}\n" for url, _ in pages]
+    remaining = max_chars - sum(len(header) + 2 for header in headers)
+    allowance = {}
+
+    by_length = sorted(range(len(pages)), key=lambda i: len(pages[i][1]))
+    for position, i in enumerate(by_length):
+        allowance[i] = max(0, min(len(pages[i][1]), remaining // (len(pages) - position)))
+        remaining -= allowance[i]
+
+    sections = []
+    for i, (url, text) in enumerate(pages):
+        body = text[: allowance[i]]
+        # Cut at a line break rather than mid-sentence where possible
+        if len(body) < len(text) and "\n" in body:
+            body = body[: body.rfind("\n")]
+        if body:
+            sections.append(headers[i] + body)
+
+    return "\n\n".join(sections)
+
+
+# 🕸️ Crawls the landing page plus up to max_pages-1 keyword-prioritised same-site
+# pages (fetched concurrently) and returns one combined text within the token budget
+def crawl_site(start_url, max_pages=WEBSITE_CRAWL_MAX_PAGES, token_budget=WEBSITE_CRAWL_TOKEN_BUDGET):
+    landing = get_page(start_url)
+    landing_text, links = extract_page(landing.content, landing.url)
+    pages = [(landing.url, landing_text)]
+
+    targets = select_links(landing.url, links, max(0, max_pages - 1))
+    if targets:
+        print(f"🕸️ Crawling {len(targets)} more page(s) of {_site(landing.url)}")
+        prefetch(targets)
+
+    for url in targets:
+        try:
+            page = get_page(url)
+        except Exception as e:
+            print(f"⚠️ Skipping {url}: {e}")
+            continue
+
+        if page.status_code >= 400 or "html" not in page.content_type.lower():
+            continue
+
+        # Redirects can leave the site (e.g. to a booking platform)
+        if _site(page.url) != _site(landing.url):
+            continue
+
+        text, _ = extract_page(page.content, page.url)
+        pages.append((page.url, text))
+
+    return combine_pages(strip_boilerplate(pages), token_budget * CHARS_PER_TOKEN)
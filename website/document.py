@@ -1,4 +1,3 @@
-from docx import Document
 import io
 import re
 
@@ -6,6 +5,8 @@ import re
 # 📝 Converts a structured summary JSON into a formatted in-memory DOCX file
 def create_docx_in_memory(summary_json, document_title):
     
+    from docx import Document
+
     # Create a new Word document
     doc = Document()
     doc.add_heading(document_title, level=0)     # Add title as top-level heading
@@ -1,25 +1,181 @@
-import requests
-from bs4 import BeautifulSoup
+# 📦 Standard Libraries
+import os
+import re
+import codecs
+from urllib.parse import urljoin
 
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
 
-# 🌐 Extracts clean, readable text content from a web page (URL)
-def extract_text_from_url(url):
-    # 🔗 Send an HTTP GET request to the target URL
-    response = requests.get(url)
+# 🔗 Shared, pooled page fetcher
+from website.fetch import get_page
+
+# 🔐 Load environment variables
+load_dotenv()
+
+# ⚙️ HTML-to-text backend: "auto" (lxml when installed), "lxml" or "bs4"
+WEBSITE_HTML_BACKEND = os.getenv("WEBSITE_HTML_BACKEND", "auto").lower()
+
+# 🚫 Elements whose content is never visible text
+DROPPED_TAGS = ("script", "style", "noscript", "svg")
+
+# 📏 Bytes handed to the streaming parser per feed() call
+FEED_CHUNK_BYTES = 64 * 1024
+
+
+# 🏷️ <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_:.-]+)""", re.I)
+
+
+# ✂️ Non-empty stripped lines of one text node
+def _lines(text):
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            yield line
+
+
+# 🐍 BeautifulSoup (html.parser) backend: builds the full tree, then flattens it
+def iter_text_blocks_bs4(content, links=None):
+    from bs4 import BeautifulSoup
 
     # 🧽 Parse the HTML content using BeautifulSoup
-    soup = BeautifulSoup(response.content, "html.parser")
+    soup = BeautifulSoup(content, "html.parser")
+
+    # 🚫 Remove unwanted script, style and graphics elements to avoid clutter
+    for element in soup(DROPPED_TAGS):
+        element.decompose()
+
+    # 🔗 Collect links before the tree is flattened to text
+    if links is not None:
+        for a in soup.find_all("a", href=True):
+            links.append((a["href"], a.get_text(" ", strip=True)))
+
+    # 📃 Visible text, one block per non-empty line
+    for string in soup.strings:
+        yield from _lines(string)
+
+
+# ⚡ Parser target for lxml: receives SAX-style callbacks from libxml2 without building
+# a tree, so script/style/noscript/svg subtrees are skipped in the same single pass
+class _TextTarget:
+    def __init__(self, links):
+        self.links = links
+        self.blocks = []
+        self._text = []
+        self._skip_depth = 0
+        self._anchor = None  # (href, [text parts]) while inside an <a href>
+
+    # Text between two tags is one node (like a BeautifulSoup string)
+    def _flush(self):
+        if self._text:
+            text = "".join(self._text)
+            self._text = []
+            self.blocks.extend(_lines(text))
+            if self._anchor is not None:
+                self._anchor[1].append(text.strip())
+
+    def start(self, tag, attrib):
+        self._flush()
+        if self._skip_depth or tag in DROPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "a" and self.links is not None and "href" in attrib:
+            self._anchor = (attrib["href"], [])
+
+    def end(self, tag):
+        self._flush()
+        if self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "a" and self._anchor is not None:
+            href, parts = self._anchor
+            self.links.append((href, " ".join(part for part in parts if part)))
+            self._anchor = None
 
-    # 🚫 Remove unwanted script and style elements to avoid clutter
-    for script in soup(["script", "style"]):
-        script.decompose()
+    def data(self, data):
+        if not self._skip_depth:
+            self._text.append(data)
 
-    # 📃 Extract visible text from the page with newlines separating blocks
-    text = soup.get_text(separator="\n")
+    def comment(self, text):
+        self._flush()
 
-    # 🧹 Strip whitespace from each line and remove empty lines
-    lines = [line.strip() for line in text.splitlines()]
-    cleaned_text = "\n".join(line for line in lines if line)
+    def close(self):
+        self._flush()
+
+
+# 🔤 Page encoding, detected the way BeautifulSoup does it: byte-order mark, then a
+# declared meta charset, then UTF-8 if the bytes decode cleanly, else Windows-1252
+def sniff_encoding(content):
+    for bom, encoding in (
+        (codecs.BOM_UTF8, "utf-8"),
+        (codecs.BOM_UTF16_LE, "utf-16-le"),
+        (codecs.BOM_UTF16_BE, "utf-16-be"),
+    ):
+        if content.startswith(bom):
+            return encoding
+
+    match = _META_CHARSET.search(content[:4096])
+    if match:
+        declared = match.group(1).decode("ascii").lower()
+        try:
+            return codecs.lookup(declared).name
+        except LookupError:
+            pass
+
+    try:
+        content.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "windows-1252"
+
+
+# ⚡ lxml (libxml2) backend: feeds the page in chunks and yields text blocks as they
+# are parsed
+def iter_text_blocks_lxml(content, links=None):
+    from lxml import etree  # Optional dependency, checked by get_html_backend()
+
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    target = _TextTarget(links)
+    parser = etree.HTMLParser(target=target, encoding=sniff_encoding(content))
+
+    for offset in range(0, len(content), FEED_CHUNK_BYTES):
+        parser.feed(content[offset : offset + FEED_CHUNK_BYTES])
+        yield from target.blocks
+        target.blocks.clear()
+
+    parser.close()
+    yield from target.blocks
+
+
+# 🔀 Backend chosen by WEBSITE_HTML_BACKEND; "auto" uses lxml when it is installed
+def get_html_backend(name=None):
+    name = name or WEBSITE_HTML_BACKEND
+    if name == "bs4":
+        return iter_text_blocks_bs4
+    if name == "auto":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            return iter_text_blocks_bs4
+    return iter_text_blocks_lxml
+
+
+# 🧾 Parses a downloaded HTML page into clean text plus its outgoing links
+# (absolute URL, anchor text) — one parse serves both extraction and crawling
+def extract_page(content, base_url="", backend=None):
+    links = []
+    blocks = get_html_backend(backend)(content, links)
+    cleaned_text = "\n".join(blocks)
+
+    return cleaned_text, [(urljoin(base_url, href), label) for href, label in links]
+
+
+# 🌐 Extracts clean, readable text content from a web page (URL)
+def extract_text_from_url(url):
+    # 🔗 Pooled GET with timeouts and a size cap (prefetched ahead of time when possible)
+    page = get_page(url)
 
     # 🧾 Return the fully cleaned body text
-    return cleaned_text
+    text, _ = extract_page(page.content, page.url)
+    return text
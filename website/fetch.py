@@ -0,0 +1,231 @@
+# 📦 Standard Libraries
+import os
+import time
+import socket
+import threading
+from collections import deque
+from typing import NamedTuple
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
+
+# 🔐 Load environment variables
+load_dotenv()
+
+# ⚙️ Fetch limits: timeouts (seconds), size cap, parallelism overall and per host
+WEBSITE_CONNECT_TIMEOUT = float(os.getenv("WEBSITE_CONNECT_TIMEOUT", "5"))
+WEBSITE_READ_TIMEOUT = float(os.getenv("WEBSITE_READ_TIMEOUT", "20"))
+WEBSITE_MAX_BYTES = int(os.getenv("WEBSITE_MAX_MB", "5")) * 1024 * 1024
+WEBSITE_FETCH_WORKERS = int(os.getenv("WEBSITE_FETCH_WORKERS", "8"))
+WEBSITE_PER_HOST_LIMIT = int(os.getenv("WEBSITE_PER_HOST_LIMIT", "2"))
+
+# ⏱️ Wall-clock limit for one page, so a server trickling bytes just under the read
+# timeout can't hold a worker (and the row's write-back) until the size cap
+WEBSITE_TOTAL_TIMEOUT = float(os.getenv("WEBSITE_TOTAL_TIMEOUT", "45"))
+
+# 🪟 Rows whose landing page is fetched ahead of the pipeline at once; each holds up
+# to WEBSITE_MAX_MB until its row picks it up
+WEBSITE_PREFETCH_AHEAD = int(os.getenv("WEBSITE_PREFETCH_AHEAD", "8"))
+
+USER_AGENT = "Mozilla/5.0 (compatible; SmartSummarizer/1.0)"
+
+
+# 📄 A fetched page; content is cut at WEBSITE_MAX_BYTES (truncated=True)
+class FetchedPage(NamedTuple):
+    url: str
+    status_code: int
+    content: bytes
+    content_type: str
+    truncated: bool
+
+
+_session = None
+_session_lock = threading.Lock()
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+_prefetched = {}
+_prefetched_lock = threading.Lock()
+_ahead = {}
+_ahead_queue = deque()
+_pool = None
+
+
+# 🔌 One pooled, keep-alive session shared by every fetch in the process
+def get_session():
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=WEBSITE_FETCH_WORKERS,
+                pool_maxsize=WEBSITE_FETCH_WORKERS,
+                max_retries=1,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            # Brotli is only advertised when it can be decoded
+            encodings = "gzip, deflate"
+            try:
+                import brotli  # noqa: F401
+
+                encodings += ", br"
+            except ImportError:
+                pass
+
+            session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": encodings})
+            _session = session
+
+        return _session
+
+
+# 🚦 Semaphore that caps concurrent requests to one host
+def _host_limit(url):
+    host = urlsplit(url).netloc.lower()
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(WEBSITE_PER_HOST_LIMIT)
+        return _host_limits[host]
+
+
+# 🔌 Hard stop for a streamed response: shutting the socket down wakes a read blocked
+# on it (closing the response would wait for that read to finish first)
+def _abort(response):
+    raw = response.raw
+    connection = getattr(raw, "connection", None) or getattr(raw, "_connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is None:
+        # urllib3 1.x can drop the connection reference while streaming
+        fp = getattr(getattr(raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(fp, "raw", None), "_sock", None)
+
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Already closed
+
+
+# 🔗 Fetch a URL with timeouts, reading the (decompressed) body as a stream up to the
+# size cap and the wall-clock limit
+def fetch_url(url, max_bytes=WEBSITE_MAX_BYTES, total_timeout=WEBSITE_TOTAL_TIMEOUT):
+    with _host_limit(url):
+        deadline = time.monotonic() + total_timeout
+        with get_session().get(
+            url,
+            stream=True,
+            timeout=(WEBSITE_CONNECT_TIMEOUT, WEBSITE_READ_TIMEOUT),
+        ) as response:
+            body = bytearray()
+            truncated = False
+
+            # ⏰ A blocked read only notices the deadline when its socket is shut down
+            expired = threading.Event()
+            timer = threading.Timer(
+                max(0.0, deadline - time.monotonic()),
+                lambda: (expired.set(), _abort(response)),
+            )
+            timer.daemon = True
+            timer.start()
+
+            try:
+                for block in response.iter_content(64 * 1024):
+                    body += block
+                    if len(body) >= max_bytes:
+                        del body[max_bytes:]
+                        truncated = True
+                        break
+                    if expired.is_set():
+                        break
+            except Exception:
+                if not expired.is_set():
+                    raise
+            finally:
+                timer.cancel()
+
+    if expired.is_set():
+        if not body:
+            raise TimeoutError(f"{url} sent nothing within {total_timeout:g}s")
+        truncated = True
+        print(f"⏱️ {url} took over {total_timeout:g}s — using the first part only")
+    elif truncated:
+        print(f"✂️ {url} exceeded {max_bytes / 1024 / 1024:.1f}MB — using the first part only")
+
+    return FetchedPage(
+        url=response.url,
+        status_code=response.status_code,
+        content=bytes(body),
+        content_type=response.headers.get("Content-Type", ""),
+        truncated=truncated,
+    )
+
+
+# 🏊 Background pool that fetches pages ahead of the summarizer
+def _get_pool():
+    global _pool
+
+    with _prefetched_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=WEBSITE_FETCH_WORKERS, thread_name_prefix="fetch"
+            )
+        return _pool
+
+
+# 🚀 Start fetching many URLs concurrently; get_page() picks the results up later
+def prefetch(urls):
+    pool = _get_pool()
+    with _prefetched_lock:
+        for url in urls:
+            if url and url not in _prefetched:
+                _prefetched[url] = pool.submit(fetch_url, url)
+
+
+# 🪟 Start queued look-ahead fetches until WEBSITE_PREFETCH_AHEAD are held (called
+# with the lock held; the pool exists once anything was queued)
+def _fill_ahead():
+    while _ahead_queue and len(_ahead) < WEBSITE_PREFETCH_AHEAD:
+        url = _ahead_queue.popleft()
+        _ahead[url] = _pool.submit(fetch_url, url)
+
+
+# 🔭 Queue landing pages of upcoming rows; only a window of them is fetched and held
+# at once, the next starts when a row picks its page up (or discards it)
+def prefetch_ahead(urls):
+    urls = list(urls)  # Consume the generator before taking the lock
+    _get_pool()
+    with _prefetched_lock:
+        for url in urls:
+            if url and url not in _ahead and url not in _ahead_queue:
+                _ahead_queue.append(url)
+        _fill_ahead()
+
+
+# 🗑️ Drop a look-ahead page a row will never pick up (skipped or resumed row)
+def discard_page(url):
+    with _prefetched_lock:
+        future = _ahead.pop(url, None)
+        if future is not None:
+            future.cancel()
+        elif url in _ahead_queue:
+            _ahead_queue.remove(url)
+        _fill_ahead()
+
+
+# 📥 Page for a URL: the prefetched result if there is one, otherwise fetch it now
+def get_page(url):
+    with _prefetched_lock:
+        future = _prefetched.pop(url, None) or _ahead.pop(url, None)
+        if url in _ahead_queue:
+            _ahead_queue.remove(url)  # Not started yet: fetch it right here instead
+        _fill_ahead()
+
+    if future is not None:
+        return future.result()
+    return fetch_url(url)
@@ -1,12 +1,16 @@
-import openai
 import json
-import os
 import re
 from dotenv import load_dotenv
+from utils.llm_cache import get_response_cache
+from utils.openai_gateway import get_openai_gateway
 
 # 🔐 Load environment variables from .env (including OpenAI key)
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_KEY")
+
+# 🤖 Model settings (also part of the response cache key)
+SUMMARY_MODEL = "gpt-4.1-2025-04-14"
+SUMMARY_TEMPERATURE = 0.3  # Low temp for consistent, deterministic structure
+SYSTEM_PROMPT = "You are a helpful assistant."
 
 
 # 📊 Summarizes raw website content into a structured JSON using OpenAI GPT
@@ -61,15 +65,25 @@ Use this exact structure:
 Analyze this content:
 \"\"\"{webpage_text}\"\"\"
 """
-    # 🤖 Send request to GPT with structured prompt
+    # ♻️ Reuse the parsed result if this exact page content was summarized before
+    cache = get_response_cache()
+    if cache:
+        cached = cache.get(SUMMARY_MODEL, SUMMARY_TEMPERATURE, SYSTEM_PROMPT, prompt)
+        if cached is not None:
+            print("♻️ Using cached website summary.")
+            return cached
+
+    # 🤖 Send request to GPT with structured prompt (paced and retried by the gateway)
+    raw_text = ""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4.1-2025-04-14",
+        response = get_openai_gateway().chat_completion(
+            idempotent=True,  # Same prompt, same summary: safe to hedge
+            model=SUMMARY_MODEL,
             messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
-            temperature=0.3,  # Low temp for consistent, deterministic structure
+            temperature=SUMMARY_TEMPERATURE,
         )
 
         # 🧾 Extract response text
@@ -94,7 +108,12 @@ Analyze this content:
         match = re.search(r"{.*}", raw_text, re.DOTALL)
         json_text = match.group(0) if match else raw_text
 
-        return json.loads(json_text)
+        summary = json.loads(json_text)
+
+        # 💾 Only successfully parsed JSON is cached, never the fallback below
+        if cache:
+            cache.set(SUMMARY_MODEL, SUMMARY_TEMPERATURE, SYSTEM_PROMPT, prompt, summary)
+        return summary
 
     # ❌ Handle failures in GPT response or JSON parsing
     except Exception as e: